@@ -0,0 +1,11 @@
+"""
+Shared pytest configuration.
+
+Puts the repository root on sys.path once per session so tests can import
+the ``src`` package without adjusting the path themselves.
+"""
+
+import pathlib
+import sys
+
+sys.path.insert(0, str(pathlib.Path(__file__).parent))
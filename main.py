@@ -342,7 +342,9 @@ class Application:
             if hasattr(self.audio_handler, "_p") and self.audio_handler._p:
                 self.audio_handler.terminate_pyaudio()
 
-            # Add any other cleanup needed for LLMHandler, TranscriptionHandler if necessary
+            self.transcription_handler.close()
+
+            # Add any other cleanup needed for LLMHandler if necessary
 
         except Exception as e:
             log_text("SHUTDOWN_ERROR", f"Error during shutdown: {e}")
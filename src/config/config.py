@@ -102,6 +102,13 @@ AVAILABLE_ASR_MODELS = {
     "Whisper (large-v3-turbo)": "mlx-community/whisper-large-v3-turbo",
 }
 DEFAULT_ASR_MODEL = "mlx-community/whisper-large-v3-turbo"
+# Explicit model family for repos whose names are ambiguous, e.g. {"org/some-asr-repo": "parakeet"}
+MODEL_TYPE_OVERRIDES = {}
+# ASR inference precision: "fp16" (half precision where the GPU supports it) or "fp32".
+# For lower-bit weights pick a pre-quantized repo (e.g. an mlx-community "-4bit" Whisper).
+ASR_PRECISION = "fp16"
+# Max utterances transcribed at once; ASR models share one GPU, so >1 mostly adds contention
+TRANSCRIPTION_CONCURRENCY = 1
 
 # WHISPER_MODEL = "mlx-community/whisper-large-v3-turbo" # Or choose another compatible model
 # WHISPER_MODEL = "mlx-community/parakeet-tdt-0.6b-v2" # Or choose another compatible model
@@ -215,6 +222,14 @@ if _ct_verbose is not None:
     except Exception:
         pass
 
+# CT_TEMP_AUDIO_FOLDER=/path points temp WAVs at a RAM-backed dir (e.g. /private/tmp or a ramdisk)
+_ct_temp_audio_folder = os.getenv("CT_TEMP_AUDIO_FOLDER")
+if _ct_temp_audio_folder and _ct_temp_audio_folder.strip():
+    TEMP_AUDIO_FOLDER = os.path.expanduser(_ct_temp_audio_folder.strip())
+
+# Handler status lines ("TranscriptionHandler Status: ...") are echoed to stderr only when verbose
+VERBOSE_STATUS = not MINIMAL_TERMINAL_OUTPUT
+
 # CT_LOG_WHITELIST="A,B,C" adds labels to terminal whitelist
 _ct_log_whitelist = os.getenv("CT_LOG_WHITELIST")
 if _ct_log_whitelist:
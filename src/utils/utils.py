@@ -1,32 +1,111 @@
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
 import time
 from src.config import config
-import os
+
+# Log file writes go through a QueueListener thread so callers never block on disk I/O
+_log_queue = queue.SimpleQueue()
+_log_listener = None
+_log_listener_lock = threading.Lock()
+_file_logger = logging.getLogger("openscribe.transcript_log")
+_file_logger.propagate = False
+
+
+class _ByteCountingRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """RotatingFileHandler that keeps a running byte count instead of querying the stream per record.
+
+    The file is only stat'ed once when first opened and again when the count
+    says the limit is reached, so writes by other processes are still honored.
+    """
+
+    _bytes_written = None
+
+    def _file_size(self) -> int:
+        try:
+            return os.path.getsize(self.baseFilename)
+        except OSError:
+            return 0
+
+    def shouldRollover(self, record) -> bool:
+        if self.maxBytes <= 0:
+            return False
+        if self._bytes_written is None:
+            self._bytes_written = self._file_size()
+        self._pending_bytes = len((self.format(record) + self.terminator).encode(self.encoding or "utf-8"))
+        if self._bytes_written + self._pending_bytes < self.maxBytes:
+            return False
+        self._bytes_written = self._file_size()
+        return self._bytes_written > 0 and self._bytes_written + self._pending_bytes >= self.maxBytes
+
+    def doRollover(self):
+        super().doRollover()
+        self._bytes_written = 0
+
+    def emit(self, record):
+        super().emit(record)
+        if self._bytes_written is not None:
+            self._bytes_written += getattr(self, "_pending_bytes", 0)
+
+
+def _rotated_log_name(default_name: str) -> str:
+    """Keep the historical single backup name (<log>.old) instead of <log>.1."""
+    return default_name.rsplit(".", 1)[0] + ".old"
+
+
+def _ensure_log_listener():
+    global _log_listener
+    if _log_listener is not None:
+        return
+    with _log_listener_lock:
+        if _log_listener is None:
+            file_handler = _ByteCountingRotatingFileHandler(
+                config.LOG_FILE, maxBytes=1024 * 1024, backupCount=1, encoding="utf-8", delay=True
+            )
+            file_handler.namer = _rotated_log_name
+            file_handler.setFormatter(logging.Formatter("%(message)s"))
+            _file_logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+            _file_logger.setLevel(logging.INFO)
+            _log_listener = logging.handlers.QueueListener(_log_queue, file_handler)
+            _log_listener.start()
+
+
+def flush_logs():
+    """Writes any queued log entries and stops the writer thread (called at exit)."""
+    global _log_listener
+    with _log_listener_lock:
+        listener, _log_listener = _log_listener, None
+        if listener is not None:
+            for handler in list(_file_logger.handlers):
+                _file_logger.removeHandler(handler)
+            listener.stop()
+            for handler in listener.handlers:
+                handler.close()
+
+
+atexit.register(flush_logs)
 
 
 def log_text(label: str, content: str):
     """Logs a message with a timestamp and label to the configured log file with rotation."""
     timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-    log_entry = f"{timestamp} [{label}] {content}\n"
+    log_entry = f"{timestamp} [{label}] {content}"
     # Controlled terminal printing: keep stdout quiet unless label is whitelisted or minimal mode is off
     try:
         if not getattr(config, "MINIMAL_TERMINAL_OUTPUT", False) or (
             hasattr(config, "TERMINAL_LOG_WHITELIST") and label in config.TERMINAL_LOG_WHITELIST
         ):
-            print(log_entry.strip())
+            sys.stdout.write(log_entry.strip() + "\n")
     except Exception:
         # Fall back to printing on any config access error
-        print(log_entry.strip())
+        sys.stdout.write(log_entry.strip() + "\n")
 
     try:
-        # Check if log file exists and rotate if it's too large
-        if (
-            os.path.exists(config.LOG_FILE)
-            and os.path.getsize(config.LOG_FILE) > 1024 * 1024
-        ):  # 1MB
-            # Simple rotation: rename existing file with a number suffix
-            os.replace(config.LOG_FILE, config.LOG_FILE + ".old")
-
-        with open(config.LOG_FILE, "a", encoding="utf-8") as log_file:
-            log_file.write(log_entry)
+        _ensure_log_listener()
+        _file_logger.info(log_entry)
     except Exception as e:
         print(f"Error writing to log file {config.LOG_FILE}: {e}")
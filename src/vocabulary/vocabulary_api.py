@@ -7,7 +7,7 @@ import json
 import os
 from pathlib import Path
 from typing import Dict, List, Optional, Any
-from .vocabulary_manager import get_vocabulary_manager
+from .vocabulary_manager import get_vocabulary_manager, MSGPACK_AVAILABLE
 
 
 class VocabularyAPI:
@@ -33,25 +33,8 @@ class VocabularyAPI:
     def get_vocabulary_list(self, search_filter: str = "", category_filter: str = "") -> Dict[str, Any]:
         """Get the current vocabulary list with optional filtering."""
         try:
-            terms = []
-            for key, term_data in self.vocab_manager.custom_terms.items():
-                # Apply filters
-                if search_filter and search_filter.lower() not in term_data['correct'].lower():
-                    continue
-                if category_filter and term_data['category'] != category_filter:
-                    continue
-                
-                terms.append({
-                    'key': key,
-                    'correct': term_data['correct'],
-                    'variations': term_data['variations'],
-                    'category': term_data['category'],
-                    'usage_count': term_data['usage_count'],
-                    'added_date': term_data.get('added_date', '')
-                })
-            
-            # Sort by usage count (most used first), then alphabetically
-            terms.sort(key=lambda x: (-x['usage_count'], x['correct'].lower()))
+            # Filtered and sorted by usage count (most used first), then alphabetically
+            terms = self.vocab_manager.list_terms(search_filter, category_filter)
             
             return {
                 "success": True,
@@ -99,11 +82,12 @@ class VocabularyAPI:
             
             # Remove variations if specified
             if remove_variations:
-                removed_variations = []
-                for variation in remove_variations:
-                    if variation in term_data['variations']:
-                        term_data['variations'].remove(variation)
-                        removed_variations.append(variation)
+                current_variations = set(term_data['variations'])
+                removed_variations = [v for v in dict.fromkeys(remove_variations) if v in current_variations]
+                if removed_variations:
+                    # One filtering pass instead of a list.remove() scan per variation
+                    to_remove = set(removed_variations)
+                    term_data['variations'][:] = [v for v in term_data['variations'] if v not in to_remove]
                 
                 if removed_variations:
                     changes_made.append(f"removed {len(removed_variations)} variations: {', '.join(removed_variations)}")
@@ -125,6 +109,7 @@ class VocabularyAPI:
                     changes_made.append(f"added {len(added_variations)} new variations: {', '.join(added_variations)}")
             
             if changes_made:
+                self.vocab_manager.rebuild_corrections_index()
                 self.vocab_manager.save_vocabulary()
                 return {
                     "success": True,
@@ -148,6 +133,7 @@ class VocabularyAPI:
             if term_key in self.vocab_manager.custom_terms:
                 term_name = self.vocab_manager.custom_terms[term_key]['correct']
                 del self.vocab_manager.custom_terms[term_key]
+                self.vocab_manager.rebuild_corrections_index()
                 self.vocab_manager.save_vocabulary()
                 return {
                     "success": True,
@@ -168,6 +154,10 @@ class VocabularyAPI:
         """Import a vocabulary template."""
         try:
             template_path = Path(f"data/vocabulary_templates/{template_name}.json")
+            binary_path = template_path.with_suffix(".msgpack")
+            if MSGPACK_AVAILABLE and binary_path.exists():
+                # Binary copy of the same template: smaller and faster to parse
+                template_path = binary_path
             
             if not template_path.exists():
                 return {
@@ -193,10 +183,10 @@ class VocabularyAPI:
                 "error": str(e)
             }
     
-    def export_vocabulary(self, filepath: str) -> Dict[str, Any]:
-        """Export vocabulary to a file."""
+    def export_vocabulary(self, filepath: str, binary: bool = False) -> Dict[str, Any]:
+        """Export vocabulary to a file (msgpack if ``binary``)."""
         try:
-            success = self.vocab_manager.export_vocabulary(filepath)
+            success = self.vocab_manager.export_vocabulary(filepath, binary)
             
             if success:
                 return {
@@ -220,6 +210,7 @@ class VocabularyAPI:
             term_count = len(self.vocab_manager.custom_terms)
             self.vocab_manager.custom_terms = {}
             self.vocab_manager.learning_patterns = {}
+            self.vocab_manager.rebuild_corrections_index()
             self.vocab_manager.save_vocabulary()
             
             return {
@@ -280,62 +271,47 @@ def get_vocabulary_api() -> VocabularyAPI:
     return _vocabulary_api
 
 
+# Command name -> handler(api, kwargs); built once instead of an if/elif chain per call
+_DISPATCH = {
+    "add_term": lambda api, kw: api.add_term(
+        kw.get("correct_term", ""),
+        kw.get("variations", []),
+        kw.get("category", "general")
+    ),
+    "get_list": lambda api, kw: api.get_vocabulary_list(
+        kw.get("search", ""),
+        kw.get("category", "")
+    ),
+    "get_stats": lambda api, kw: api.get_vocabulary_stats(),
+    "edit_term": lambda api, kw: api.edit_term(
+        kw.get("term_key", ""),
+        kw.get("category"),
+        kw.get("additional_variations", []),
+        kw.get("remove_variations", [])
+    ),
+    "delete_term": lambda api, kw: api.delete_term(kw.get("term_key", "")),
+    "import_template": lambda api, kw: api.import_template(kw.get("template_name", "")),
+    "export": lambda api, kw: api.export_vocabulary(kw.get("filepath", ""), kw.get("binary", False)),
+    "clear_all": lambda api, kw: api.clear_vocabulary(),
+    "learn_correction": lambda api, kw: api.learn_correction(
+        kw.get("original", ""),
+        kw.get("corrected", ""),
+        kw.get("context", "")
+    ),
+    "get_suggestions": lambda api, kw: api.get_suggestions(
+        kw.get("text", ""),
+        kw.get("max_suggestions", 3)
+    ),
+}
+
+
 # Convenience functions for direct calling from main app
 def handle_vocabulary_command(command: str, **kwargs) -> Dict[str, Any]:
     """Handle vocabulary commands from the main application."""
-    api = get_vocabulary_api()
-    
-    if command == "add_term":
-        return api.add_term(
-            kwargs.get("correct_term", ""),
-            kwargs.get("variations", []),
-            kwargs.get("category", "general")
-        )
-    
-    elif command == "get_list":
-        return api.get_vocabulary_list(
-            kwargs.get("search", ""),
-            kwargs.get("category", "")
-        )
-    
-    elif command == "get_stats":
-        return api.get_vocabulary_stats()
-    
-    elif command == "edit_term":
-        return api.edit_term(
-            kwargs.get("term_key", ""),
-            kwargs.get("category"),
-            kwargs.get("additional_variations", []),
-            kwargs.get("remove_variations", [])
-        )
-    
-    elif command == "delete_term":
-        return api.delete_term(kwargs.get("term_key", ""))
-    
-    elif command == "import_template":
-        return api.import_template(kwargs.get("template_name", ""))
-    
-    elif command == "export":
-        return api.export_vocabulary(kwargs.get("filepath", ""))
-    
-    elif command == "clear_all":
-        return api.clear_vocabulary()
-    
-    elif command == "learn_correction":
-        return api.learn_correction(
-            kwargs.get("original", ""),
-            kwargs.get("corrected", ""),
-            kwargs.get("context", "")
-        )
-    
-    elif command == "get_suggestions":
-        return api.get_suggestions(
-            kwargs.get("text", ""),
-            kwargs.get("max_suggestions", 3)
-        )
-    
-    else:
+    handler = _DISPATCH.get(command)
+    if handler is None:
         return {
             "success": False,
             "error": f"Unknown vocabulary command: {command}"
-        } 
\ No newline at end of file
+        }
+    return handler(get_vocabulary_api(), kwargs)
@@ -7,16 +7,52 @@ import json
 import re
 import os
 import csv
-from typing import Dict, List, Optional, Tuple, Set
+import time
+import atexit
+import weakref
+import functools
+import itertools
+import mmap
+import stat
+import tempfile
+import threading
+from collections import defaultdict, deque
+from typing import Deque, Dict, Iterator, List, Optional, Tuple, Set
 from pathlib import Path
 import difflib
 from datetime import datetime
 
 try:
-    import phonetics  # double metaphone
-    PHONETICS_AVAILABLE = True
+    import numpy as np
+    from rapidfuzz import fuzz  # C++ fuzzy matching for suggestions
+    from rapidfuzz.process import cdist as fuzz_cdist
+    RAPIDFUZZ_AVAILABLE = True
 except Exception:
-    PHONETICS_AVAILABLE = False
+    RAPIDFUZZ_AVAILABLE = False
+
+try:
+    import orjson  # fast JSON (de)serialization for vocabulary files
+    ORJSON_AVAILABLE = True
+except Exception:
+    ORJSON_AVAILABLE = False
+
+try:
+    from symspellpy import SymSpell, Verbosity  # symmetric-delete index for medical fuzzy lookup
+    SYMSPELL_AVAILABLE = True
+except Exception:
+    SYMSPELL_AVAILABLE = False
+
+try:
+    import msgpack  # compact binary vocabulary exports/templates
+    MSGPACK_AVAILABLE = True
+except Exception:
+    MSGPACK_AVAILABLE = False
+
+try:
+    import ahocorasick  # pyahocorasick: single-pass multi-pattern matching
+    AHOCORASICK_AVAILABLE = True
+except Exception:
+    AHOCORASICK_AVAILABLE = False
 
 try:
     # Optional import; used only for path resolution
@@ -26,8 +62,435 @@ except Exception:
     CONFIG_AVAILABLE = False
 
 
+@functools.lru_cache(maxsize=8)
+def _compile_variation_regex(variations: Tuple[str, ...]) -> "re.Pattern":
+    """Compile one case-insensitive, word-bounded alternation (longest variation first).
+
+    Cached on the sorted variation tuple, so rebuilding the index after an edit
+    that doesn't touch variations reuses the compiled pattern.
+    """
+    alternation = "|".join(re.escape(v) for v in variations)
+    return re.compile(r'\b(?:' + alternation + r')\b', re.IGNORECASE)
+
+
+# Substring markers used by _categorize_term (matched anywhere in the lowercased term)
+_MEDICATION_MARKERS_RE = re.compile(r'mycin|cillin|phen|zole|pine')
+_TECHNICAL_MARKERS_RE = re.compile(r'itis|osis|emia|pathy|gram|scopy|monia|thorax|tension')
+_NAME_TITLES = ('Dr.', 'Doctor', 'Mr.', 'Mrs.', 'Ms.', 'Prof.', 'Professor')
+
+
+@functools.lru_cache(maxsize=4096)
+def _categorize(term: str) -> str:
+    """Pure, memoized body of VocabularyManager._categorize_term."""
+    term_lower = term.lower()
+
+    # Technical/medication patterns
+    if _MEDICATION_MARKERS_RE.search(term_lower):
+        return "medication"
+
+    # Professional titles
+    if term.startswith(_NAME_TITLES):
+        return "names"
+
+    # Technical procedures/conditions (common suffixes and specific terms)
+    if _TECHNICAL_MARKERS_RE.search(term_lower):
+        return "technical_terms"
+
+    return "general"
+
+
+def _lcs_ratio(a, b):
+    """2*LCS/(len(a)+len(b)) for uint8 arrays, len(a) <= 64 (bit-parallel LCS, one 64-bit word)."""
+    n = a.shape[0]
+    total = n + b.shape[0]
+    if n == 0:
+        return 1.0 if total == 0 else 0.0
+    peq = np.zeros(256, dtype=np.uint64)
+    one = np.uint64(1)
+    for i in range(n):
+        peq[a[i]] |= one << np.uint64(i)
+    s = ~np.uint64(0)
+    for j in range(b.shape[0]):
+        u = s & peq[b[j]]
+        s = (s + u) | (s - u)
+    # Zero bits of s within the first n positions count the LCS length
+    matched = ~s & (~np.uint64(0) >> np.uint64(64 - n))
+    lcs = 0
+    while matched:
+        matched &= matched - one
+        lcs += 1
+    return 2.0 * lcs / total
+
+
+# numba (and llvmlite) is slow to import and its kernel only matters when rapidfuzz is
+# missing, so it is imported, and _lcs_ratio compiled, on the first fallback call
+_lcs_ratio_kernel = None
+_LCS_KERNEL_CHECKED = False
+
+
+def _get_lcs_ratio_kernel():
+    """Return _lcs_ratio compiled with numba, on first call (None if numba is unavailable)."""
+    global _lcs_ratio_kernel, _LCS_KERNEL_CHECKED, np
+    if not _LCS_KERNEL_CHECKED:
+        _LCS_KERNEL_CHECKED = True
+        try:
+            import numpy as np
+            from numba import njit
+            _lcs_ratio_kernel = njit(cache=True)(_lcs_ratio)
+        except Exception:
+            pass
+    return _lcs_ratio_kernel
+
+
+def _similarity_ratio(a: str, b: str) -> float:
+    """Similarity of two lowercased strings in [0, 1].
+
+    Prefers rapidfuzz's C++ ratio, then the numba LCS kernel for ASCII
+    inputs that fit its 64-bit word, then difflib's SequenceMatcher.
+    """
+    if RAPIDFUZZ_AVAILABLE:
+        return fuzz.ratio(a, b) / 100.0
+    if a.isascii() and b.isascii() and min(len(a), len(b)) <= 64:
+        kernel = _get_lcs_ratio_kernel()
+        if kernel is not None:
+            if len(a) > len(b):
+                a, b = b, a
+            return kernel(
+                np.frombuffer(a.encode('ascii'), dtype=np.uint8),
+                np.frombuffer(b.encode('ascii'), dtype=np.uint8),
+            )
+    return difflib.SequenceMatcher(None, a, b).ratio()
+
+
+@functools.lru_cache(maxsize=4096)
+def _similarity_confidence(original: str, corrected: str) -> float:
+    """Case-insensitive similarity ratio rounded to 2 places; memoized for repeated pairs.
+
+    The ratio can't exceed 2*min(len)/(len(a)+len(b)); when that bound is already
+    below 0.3 the pair is clearly dissimilar, scoring is skipped and 0.0 is returned
+    as a "dissimilar" sentinel rather than a measured ratio.
+    """
+    shorter, longer = sorted((len(original), len(corrected)))
+    total = shorter + longer
+    upper_bound = 2 * shorter / total if total else 1.0
+    if upper_bound < 0.3:
+        return 0.0
+    return round(_similarity_ratio(original.lower(), corrected.lower()), 2)
+
+
+def _first_confident_candidate(original: str, candidates: List[str], threshold: float,
+                               max_len_diff: int = 3) -> Optional[Tuple[int, float]]:
+    """Index and score of the first candidate scoring at least ``threshold`` against ``original``.
+
+    Candidates whose length differs by more than ``max_len_diff`` or whose first letter
+    differs are skipped. With rapidfuzz the remaining pool is scored in one C++ call.
+    """
+    original_l = original.lower()
+    eligible = [
+        index for index, cand in enumerate(candidates)
+        if abs(len(cand) - len(original)) <= max_len_diff and cand[0].lower() == original_l[0]
+    ]
+    if not eligible:
+        return None
+    if RAPIDFUZZ_AVAILABLE:
+        scores = fuzz_cdist([original_l], [candidates[index].lower() for index in eligible],
+                            scorer=fuzz.ratio, dtype=np.float64)[0]
+        ratios = scores / 100.0
+        hits = np.flatnonzero(ratios >= threshold)
+        if hits.size == 0:
+            return None
+        return eligible[hits[0]], float(ratios[hits[0]])
+    for index in eligible:
+        score = _similarity_ratio(original_l, candidates[index].lower())
+        if score >= threshold:
+            return index, score
+    return None
+
+
+# A variation made only of word characters matches exactly one \w+ token under \b...\b
+_WORD_TOKEN_RE = re.compile(r'\w+')
+_TOKEN_SPLIT_RE = re.compile(r'(\W+)')
+
+
+# Word tokens considered by the medical lexicon pass
+_MEDICAL_TOKEN_RE = re.compile(r"[A-Za-z][A-Za-z\-']*")
+# Products.txt ActiveIngredient parsing: ingredient separators and parenthesised descriptors
+_INGREDIENT_SPLIT_RE = re.compile(r"[;,+]")
+_PARENTHESIZED_RE = re.compile(r"\([^\)]*\)")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+# polars (vectorized Products.txt parsing) only serves the opt-in medical lexicon build,
+# which is cached after the first run, so like phonetics it is imported on first use
+_polars_mod = None
+_POLARS_CHECKED = False
+
+
+def _get_polars():
+    """Return the polars module, importing it on first call (None if unavailable)."""
+    global _polars_mod, _POLARS_CHECKED
+    if not _POLARS_CHECKED:
+        _POLARS_CHECKED = True
+        try:
+            import polars as _pl
+            _polars_mod = _pl
+        except Exception:
+            pass
+    return _polars_mod
+
+
+def _fda_product_terms_polars(products_path: str) -> Iterator[str]:
+    """Yield Products.txt terms in row order, with the string cleaning done by polars.
+
+    Same rules as the csv.reader loop in _load_medical_lexicon_from_fda_products:
+    the brand name, then each cleaned ingredient part (or the raw ingredient
+    string when splitting leaves no parts). Requires polars (see _get_polars).
+    """
+    pl = _get_polars()
+    df = pl.read_csv(
+        products_path, separator='\t', encoding='utf8-lossy',
+        columns=['DrugName', 'ActiveIngredient'], infer_schema_length=0,
+        truncate_ragged_lines=True,
+    )
+    drug = pl.col('DrugName').fill_null('').str.strip_chars()
+    ing = pl.col('ActiveIngredient').fill_null('').str.strip_chars()
+    parts = (
+        ing.str.replace_all(_INGREDIENT_SPLIT_RE.pattern, ';').str.split(';')
+        .list.eval(pl.element().str.strip_chars())
+        .list.eval(pl.element().filter(pl.element() != ''))
+    )
+    cleaned = (
+        parts.list.eval(pl.element().str.replace_all(_PARENTHESIZED_RE.pattern, '').str.strip_chars())
+        .list.eval(pl.element().filter(pl.element() != ''))
+    )
+    rows = df.select(
+        drug.alias('drug'),
+        ((drug != '') & (drug.str.to_uppercase() != 'UNKNOWN')).alias('drug_ok'),
+        ((ing != '') & (ing.str.to_uppercase() != 'UNKNOWN')).alias('ing_ok'),
+        pl.when(parts.list.len() == 0).then(pl.concat_list([ing])).otherwise(cleaned).alias('terms'),
+    )
+    for drug_name, drug_ok, ing_ok, terms in rows.iter_rows():
+        if drug_ok:
+            yield drug_name
+        if ing_ok:
+            yield from terms
+
+
+# phonetics (double metaphone) is only needed by the medical lexicon, which is off by
+# default, so it is imported on first use rather than with this module
+_phonetics_mod = None
+_PHONETICS_CHECKED = False
+
+
+def _get_phonetics():
+    """Return the phonetics module, importing it on first call (None if unavailable)."""
+    global _phonetics_mod, _PHONETICS_CHECKED
+    if not _PHONETICS_CHECKED:
+        _PHONETICS_CHECKED = True
+        try:
+            import phonetics as _p
+            _phonetics_mod = _p
+        except Exception:
+            pass
+    return _phonetics_mod
+
+
+def _dmetaphone_codes(term: str) -> Tuple[str, ...]:
+    """Distinct non-empty double-metaphone codes for ``term`` (empty without phonetics)."""
+    mod = _get_phonetics()
+    if mod is None:
+        return ()
+    try:
+        code1, code2 = mod.dmetaphone(term)
+    except Exception:
+        return ()
+    if code2 and code2 != code1:
+        return (code1, code2) if code1 else (code2,)
+    return (code1,) if code1 else ()
+
+
+# Query-side codes: dictated tokens repeat a lot, lexicon terms are encoded once at load
+_cached_dmetaphone_codes = functools.lru_cache(maxsize=4096)(_dmetaphone_codes)
+
+
+_CASE_LOWER, _CASE_UPPER, _CASE_TITLE, _CASE_MIXED = range(4)
+
+
+def _case_class(text: str) -> int:
+    """Classify the case pattern of ``text`` for _apply_case."""
+    # Lowercase is by far the most common case in dictated text, so test it first;
+    # islower/isupper are mutually exclusive and upper still wins over title
+    if text.islower():
+        return _CASE_LOWER
+    if text.isupper():
+        return _CASE_UPPER
+    if text.istitle():
+        return _CASE_TITLE
+    return _CASE_MIXED
+
+
+@functools.lru_cache(maxsize=2048)
+def _apply_case(case_class: int, replacement: str) -> str:
+    """Recase ``replacement`` to a _case_class result; memoized since canonical terms repeat."""
+    if case_class == _CASE_LOWER:
+        return replacement.lower()
+    if case_class == _CASE_UPPER:
+        return replacement.upper()
+    if case_class == _CASE_TITLE:
+        return replacement.title()
+    return replacement
+
+
+def _read_json(path) -> object:
+    """Parse a UTF-8 JSON file, using orjson when it is installed.
+
+    With orjson the file is memory-mapped and parsed in place, so no
+    intermediate bytes copy of the whole file is made.
+    """
+    if ORJSON_AVAILABLE:
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return orjson.loads(b'')  # raises the usual decode error; mmap rejects empty files
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                return orjson.loads(view)
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+# Process umask, read once: mkstemp creates files as 0600, so _write_json applies the mode
+# a plain open() would have given a new file (0666 & ~umask) before renaming it into place
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _write_json(path, data, indent: bool = True) -> None:
+    """Write data as UTF-8 JSON (indented unless ``indent`` is False), using orjson when it is installed.
+
+    The JSON goes to a temp file in the same directory that then replaces ``path``,
+    so a crash or a concurrent reader never sees a half-written file. The file keeps
+    the permissions of the one it replaces.
+    """
+    path = Path(path)
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        mode = 0o666 & ~_UMASK
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        os.chmod(tmp_path, mode)
+        if ORJSON_AVAILABLE:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2) if indent else orjson.dumps(data))
+        else:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2 if indent else None, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _is_msgpack_path(path) -> bool:
+    return str(path).lower().endswith('.msgpack')
+
+
+def _read_vocabulary_export(path) -> Dict:
+    """Return the 'terms' mapping of an export/template file (.msgpack or JSON)."""
+    if _is_msgpack_path(path):
+        if not MSGPACK_AVAILABLE:
+            raise RuntimeError("msgpack is not installed; cannot read .msgpack vocabulary files")
+        with open(path, 'rb') as f:
+            data = msgpack.unpackb(f.read(), raw=False, strict_map_key=False)
+    else:
+        data = _read_json(path)
+    return data.get('vocabulary_export', {}).get('terms', {})
+
+
+def _migrate_term_timestamps(terms: Dict[str, Dict]) -> None:
+    """Replace legacy ISO 'added_date' strings with integer 'added_ts' Unix seconds, in place."""
+    for term_data in terms.values():
+        if 'added_ts' in term_data:
+            continue
+        added_date = term_data.pop('added_date', None)
+        try:
+            term_data['added_ts'] = int(datetime.fromisoformat(added_date).timestamp()) if added_date else 0
+        except (TypeError, ValueError):
+            term_data['added_ts'] = 0
+
+
+def _format_timestamp(ts: int) -> str:
+    """ISO-8601 local time for display; empty for unknown (0) timestamps."""
+    return datetime.fromtimestamp(ts).isoformat() if ts else ''
+
+
+def _json_line(entry) -> bytes:
+    """Serialize one record as a UTF-8 JSON Lines entry (trailing newline included)."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(entry) + b'\n'
+    return json.dumps(entry, ensure_ascii=False).encode('utf-8') + b'\n'
+
+
+def _is_word_char(ch: str) -> bool:
+    """Return True for characters the ``re`` module treats as word characters."""
+    return ch.isalnum() or ch == '_'
+
+
+# 1 for bytes that are word characters when the text is ASCII, for table lookups on encoded text
+_WORD_BYTE_TABLE = bytes(1 if _is_word_char(chr(c)) else 0 for c in range(128)) + bytes(128)
+
+
+def _at_word_boundary(text: str, pos: int) -> bool:
+    """Return True if a regex word boundary holds at ``pos`` in ``text``."""
+    before = pos > 0 and _is_word_char(text[pos - 1])
+    after = pos < len(text) and _is_word_char(text[pos])
+    return before != after
+
+
+def _flush_at_exit(manager_ref) -> None:
+    """atexit hook: persist pending changes of a still-alive manager whose data dir still exists."""
+    manager = manager_ref()
+    if manager is not None and manager.config_dir.exists():
+        manager.flush()
+
+
+def _write_behind_loop(manager_ref, flush_requested: threading.Event, delay: float) -> None:
+    """Background writer: after each request, wait ``delay`` to coalesce a burst, then flush.
+
+    Holds only a weak reference so it never keeps a manager alive, and exits
+    once the manager is gone.
+    """
+    while True:
+        if not flush_requested.wait(timeout=5.0):
+            if manager_ref() is None:
+                return
+            continue
+        time.sleep(delay)
+        flush_requested.clear()
+        manager = manager_ref()
+        if manager is None:
+            return
+        if manager.config_dir.exists():
+            manager.flush()
+        del manager
+
+
 class VocabularyManager:
     """Manages custom vocabulary and learning from user corrections."""
+
+    # Debounced persistence: dirty state is written at most once per interval or per N changes
+    FLUSH_INTERVAL_SECONDS = 1.0
+    FLUSH_MAX_PENDING_CHANGES = 100
+    # Usage counts alone are low-value: save them only per N applied corrections or after a longer wait
+    USAGE_FLUSH_THRESHOLD = 50
+    USAGE_FLUSH_INTERVAL_SECONDS = 30.0
+    # suggest_corrections scores on all cores once (words x terms) reaches this size
+    SUGGEST_PARALLEL_MIN_PAIRS = 100_000
+    # In-memory caps: the newest corrections and most recently seen patterns are kept
+    CORRECTION_HISTORY_MAX = 10_000
+    LEARNING_PATTERNS_MAX = 50_000
     
     def __init__(self, config_dir: str = "data"):
         self.config_dir = Path(config_dir)
@@ -35,23 +498,71 @@ class VocabularyManager:
         
         # File paths
         self.vocabulary_file = self.config_dir / "user_vocabulary.json"
-        self.corrections_log = self.config_dir / "corrections_log.json"
+        # Append-only JSON Lines log; corrections_log.json is the pre-JSONL format
+        self.corrections_log = self.config_dir / "corrections_log.jsonl"
+        self._legacy_corrections_log = self.config_dir / "corrections_log.json"
         self.learning_stats = self.config_dir / "learning_stats.json"
         self.medical_lexicon_cache = self.config_dir / "medical_lexicon.json"
         
         # In-memory storage
         self.custom_terms: Dict[str, List[str]] = {}
-        self.correction_history: List[Dict] = []
+        # Correction history is only read on first access (see the correction_history property)
+        self._correction_history: Optional[Deque[Dict]] = None
+        self._correction_total = 0  # entries in the log, which can exceed the in-memory cap
+        # Pattern -> count, least recently seen first (see _count_pattern)
         self.learning_patterns: Dict[str, int] = {}
 
         # Medical lexicon structures
         self.medical_terms_set: Set[str] = set()  # lowercased canonical terms
         self.medical_canonical_map: Dict[str, str] = {}  # lower -> canonical (original case)
-        self.medical_metaphone_index: Dict[str, List[str]] = {}  # metaphone -> list of canonical terms
+        self.medical_metaphone_index: Dict[str, List[str]] = {}  # metaphone -> list of canonical terms (no symspellpy)
+        self._medical_symspell = None  # SymSpell index over lexicon keys, when symspellpy is installed
+        self._medical_ngram_heads: Set[str] = set()  # first token of every multi-token lexicon key
+        # (metaphone, first letter, length) -> [(position in the metaphone's list, term)]
+        self._medical_metaphone_buckets: Dict[Tuple[str, str, int], List[Tuple[int, str]]] = {}
+
+        # Aho-Corasick automaton over lowercased variations (None if unavailable/empty)
+        self._corrections_automaton = None
+        # Lowercased variation -> custom term key, plus the lazily compiled regex fallback
+        self._variation_keys: Dict[str, str] = {}
+        self._min_variation_len = 0
+        # True when every variation is a single word token, enabling the token-lookup path
+        self._single_token_variations = False
+        # Lowercased correct forms, computed once per index rebuild instead of per lookup
+        self.correct_lower_index: Dict[str, str] = {}  # term key -> correct term, lowercased
+        self._correct_lower_keys: Dict[str, str] = {}  # lowercased correct term -> first term key
+        # Lowercased correct forms and their term data, index-aligned, for suggest_corrections
+        self._term_choices: List[str] = []
+        self._term_choice_data: List[Dict] = []
+        self._corrections_regex = None
+        # Term keys per category, and a version counter bumped whenever terms or usage counts change
+        self._by_category: Dict[str, List[str]] = {}
+        self._vocab_version = 0
+        # (search, category) -> sorted term list, valid for _term_list_cache_version only
+        self._term_list_cache: Dict[Tuple[str, str], List[Dict]] = {}
+        self._term_list_cache_version = -1
+        # get_vocabulary_stats result, valid for _stats_cache_version only
+        self._stats_cache: Optional[Dict] = None
+        self._stats_cache_version = -1
+        # Usage-count increments from apply_corrections, folded into custom_terms by _merge_usage_deltas
+        self._usage_deltas: Dict[str, int] = defaultdict(int)
+        self._usage_delta_lock = threading.Lock()
+
+        # Unsaved-change tracking for the debounced save path (see _mark_dirty/flush)
+        self._dirty_vocab = False
+        self._pending_changes = 0
+        self._pending_usage_delta = 0  # corrections applied since the last vocabulary save
+        self._last_flush = time.monotonic()
+        self._flush_lock = threading.Lock()
+        # Write-behind thread, started on the first scheduled flush
+        self._flush_requested = threading.Event()
+        self._writer: Optional[threading.Thread] = None
+        atexit.register(_flush_at_exit, weakref.ref(self))
         
         # Load existing data
         self.load_vocabulary()
-        self.load_corrections()
+        self._migrate_legacy_corrections_log()
+        self.rebuild_corrections_index()
         # Attempt to load medical lexicon from cache or source (opt-in via env)
         # Enable by setting environment variable CT_ENABLE_MEDICAL_LEXICON=1
         try:
@@ -71,46 +582,184 @@ class VocabularyManager:
                 return
 
             if self.vocabulary_file.exists():
-                with open(self.vocabulary_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.custom_terms = data.get('terms', {})
-                    self.learning_patterns = data.get('patterns', {})
+                data = _read_json(self.vocabulary_file)
+                self.custom_terms = data.get('terms', {})
+                _migrate_term_timestamps(self.custom_terms)
+                self.learning_patterns = data.get('patterns', {})
+                self._trim_learning_patterns()
         except Exception as e:
             print(f"[VOCAB] Error loading vocabulary: {e}")
             self.custom_terms = {}
             self.learning_patterns = {}
     
+    def _merge_usage_deltas(self) -> None:
+        """Fold pending usage-count increments into custom_terms.
+
+        apply_corrections only bumps a per-key delta, so the hot path never
+        touches the shared term records; readers of usage_count call this first.
+        """
+        with self._usage_delta_lock:
+            if not self._usage_deltas:
+                return
+            deltas, self._usage_deltas = self._usage_deltas, defaultdict(int)
+        for key, count in deltas.items():
+            term_data = self.custom_terms.get(key)
+            if term_data is not None:  # the term may have been deleted since
+                term_data['usage_count'] += count
+        self._vocab_version += 1  # Usage counts feed the term list ordering
+
+    def _record_usage(self, keys: List[str]) -> None:
+        """Add one use per key to the pending deltas, under the lock _merge_usage_deltas swaps them with."""
+        if not keys:
+            return
+        with self._usage_delta_lock:
+            deltas = self._usage_deltas
+            for key in keys:
+                deltas[key] += 1
+
     def save_vocabulary(self) -> None:
         """Save current vocabulary to file."""
+        # Serialized with the write-behind thread's flush()
+        with self._flush_lock:
+            self._save_vocabulary_locked()
+
+    def _save_vocabulary_locked(self) -> None:
+        """save_vocabulary body; the caller must hold _flush_lock."""
+        self._merge_usage_deltas()
         try:
             data = {
                 'terms': self.custom_terms,
                 'patterns': self.learning_patterns,
                 'last_updated': datetime.now().isoformat()
             }
-            with open(self.vocabulary_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            _write_json(self.vocabulary_file, data)
+            self._dirty_vocab = False
+            self._pending_usage_delta = 0
         except Exception as e:
             print(f"[VOCAB] Error saving vocabulary: {e}")
     
+    @property
+    def correction_history(self) -> Deque[Dict]:
+        """The newest CORRECTION_HISTORY_MAX corrections, loaded from disk the first time they are needed.
+
+        The log only grows, and nothing on the dictation path reads it, so
+        parsing it at startup just delays launch.
+        """
+        if self._correction_history is None:
+            self.load_corrections()
+        return self._correction_history
+
+    @correction_history.setter
+    def correction_history(self, history: List[Dict]) -> None:
+        self._correction_history = deque(history, maxlen=self.CORRECTION_HISTORY_MAX)
+        self._correction_total = len(history)
+
     def load_corrections(self) -> None:
-        """Load correction history from file."""
+        """Load correction history from the JSON Lines log, skipping unreadable lines."""
+        history: Deque[Dict] = deque(maxlen=self.CORRECTION_HISTORY_MAX)
+        total = 0
+        loads = orjson.loads if ORJSON_AVAILABLE else json.loads
         try:
             if self.corrections_log.exists():
-                with open(self.corrections_log, 'r', encoding='utf-8') as f:
-                    self.correction_history = json.load(f)
+                with open(self.corrections_log, 'rb') as f:
+                    for line in f:
+                        if not line.strip():
+                            continue
+                        try:
+                            history.append(loads(line))
+                        except ValueError:
+                            # e.g. a line cut short by a crash mid-append
+                            continue
+                        total += 1
         except Exception as e:
             print(f"[VOCAB] Error loading corrections: {e}")
-            self.correction_history = []
+        self._correction_history = history
+        self._correction_total = total
     
     def save_corrections(self) -> None:
-        """Save correction history to file."""
+        """Kept for API compatibility; every correction is appended to the log when it is recorded.
+
+        The log holds the full history, which can be longer than the in-memory cap,
+        so saving never rewrites it. compact_corrections_log drops old entries on request.
+        """
+
+    def compact_corrections_log(self) -> None:
+        """Rewrite the correction log with only the newest CORRECTION_HISTORY_MAX corrections.
+
+        Older entries are removed from disk for good, so this only runs when called explicitly.
+        """
+        try:
+            history = self.correction_history
+            # Write aside and rename, so a failed compaction never leaves a partial log behind
+            tmp_path = self.corrections_log.with_name(self.corrections_log.name + ".tmp")
+            with open(tmp_path, 'wb') as f:
+                f.write(b''.join(_json_line(entry) for entry in history))
+            os.replace(tmp_path, self.corrections_log)
+            self._correction_total = len(history)
+            self._vocab_version += 1  # The correction total feeds the stats
+        except Exception as e:
+            print(f"[VOCAB] Error compacting corrections log: {e}")
+
+    def _append_correction(self, entry: Dict) -> None:
+        """Append one correction to the log without touching earlier entries."""
+        if self._correction_history is not None:
+            self._correction_history.append(entry)
+            self._correction_total += 1
         try:
-            with open(self.corrections_log, 'w', encoding='utf-8') as f:
-                json.dump(self.correction_history, f, indent=2, ensure_ascii=False)
+            with open(self.corrections_log, 'ab') as f:
+                f.write(_json_line(entry))
         except Exception as e:
             print(f"[VOCAB] Error saving corrections: {e}")
 
+    def _migrate_legacy_corrections_log(self) -> None:
+        """Convert a corrections_log.json list into the JSON Lines log, once."""
+        if self.corrections_log.exists() or not self._legacy_corrections_log.exists():
+            return
+        try:
+            history = _read_json(self._legacy_corrections_log)
+            # Write aside and rename, so a failed migration never leaves a partial log behind
+            tmp_path = self.corrections_log.with_name(self.corrections_log.name + ".tmp")
+            with open(tmp_path, 'wb') as f:
+                f.write(b''.join(_json_line(entry) for entry in history))
+            os.replace(tmp_path, self.corrections_log)
+            self._legacy_corrections_log.unlink()
+            self.correction_history = history
+            print(f"[VOCAB] Migrated {len(history)} corrections to {self.corrections_log.name}")
+        except Exception as e:
+            print(f"[VOCAB] Error migrating corrections log: {e}")
+
+    def _mark_dirty(self, vocabulary: bool = False) -> None:
+        """Record unsaved changes; the write-behind thread saves them after the debounce interval.
+
+        A large backlog (FLUSH_MAX_PENDING_CHANGES) is flushed synchronously instead.
+        """
+        self._dirty_vocab = self._dirty_vocab or vocabulary
+        self._pending_changes += 1
+        if self._pending_changes >= self.FLUSH_MAX_PENDING_CHANGES:
+            self.flush()
+        else:
+            self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        """Ask the write-behind thread for a flush, starting the thread if needed."""
+        if self._writer is None or not self._writer.is_alive():
+            self._writer = threading.Thread(
+                target=_write_behind_loop,
+                args=(weakref.ref(self), self._flush_requested, self.FLUSH_INTERVAL_SECONDS),
+                name="vocabulary-writer",
+                daemon=True,
+            )
+            self._writer.start()
+        self._flush_requested.set()
+
+    def flush(self) -> None:
+        """Write any unsaved vocabulary changes to disk (corrections are appended as they happen)."""
+        with self._flush_lock:
+            if self._dirty_vocab or self._pending_usage_delta:
+                self._save_vocabulary_locked()
+            self._pending_changes = 0
+            self._last_flush = time.monotonic()
+
     def _initialize_medical_lexicon(self) -> None:
         """Load medical lexicon from cache if available, otherwise try to build from FDA Products file.
 
@@ -118,17 +767,22 @@ class VocabularyManager:
         """
         try:
             if self.medical_lexicon_cache.exists():
-                with open(self.medical_lexicon_cache, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                terms = data.get('terms', [])
+                data = _read_json(self.medical_lexicon_cache)
+                entries = data.get('terms', [])
+                use_metaphone = self._medical_uses_metaphone()
+                terms = []
+                for entry in entries:
+                    # [canonical, [codes...]] entries carry precomputed metaphones; plain strings don't
+                    term = entry if isinstance(entry, str) else entry[0]
+                    terms.append(term)
+                    if use_metaphone:
+                        codes = _dmetaphone_codes(entry) if isinstance(entry, str) else entry[1]
+                        for mp in codes:
+                            self.medical_metaphone_index.setdefault(mp, []).append(term)
                 self.medical_terms_set = set(t.lower() for t in terms)
                 self.medical_canonical_map = {t.lower(): t for t in terms}
-                # Rebuild metaphone index lazily for runtime matching
-                if PHONETICS_AVAILABLE:
-                    for term in terms:
-                        for mp in self._double_metaphone_all(term):
-                            if mp:
-                                self.medical_metaphone_index.setdefault(mp, []).append(term)
+                self._build_medical_ngram_heads()
+                self._build_medical_fuzzy_index()
                 print(f"[VOCAB] Loaded medical lexicon cache with {len(self.medical_terms_set)} terms")
                 return
         except Exception as e:
@@ -156,13 +810,15 @@ class VocabularyManager:
         if source_path:
             try:
                 count = self._load_medical_lexicon_from_fda_products(source_path)
+                self._build_medical_ngram_heads()
+                self._build_medical_fuzzy_index()
                 print(f"[VOCAB] Built medical lexicon from '{source_path}' with {count} unique terms")
                 # Persist cache
                 try:
-                    with open(self.medical_lexicon_cache, 'w', encoding='utf-8') as f:
-                        json.dump({
-                            'terms': sorted(self.medical_canonical_map.values())
-                        }, f, indent=2, ensure_ascii=False)
+                    # Machine-only cache: compact output is smaller and quicker to parse at startup
+                    _write_json(self.medical_lexicon_cache, {
+                        'terms': self._medical_cache_entries()
+                    }, indent=False)
                 except Exception as e:
                     print(f"[VOCAB] Error saving medical lexicon cache: {e}")
             except Exception as e:
@@ -171,62 +827,127 @@ class VocabularyManager:
             # Silently skip if not available
             print("[VOCAB] FDA Products.txt not found - medical lexicon disabled")
 
+    def _medical_cache_entries(self) -> List:
+        """Sorted lexicon terms for the cache file, as [term, [codes...]] when metaphones are indexed."""
+        terms = sorted(self.medical_canonical_map.values())
+        if not self.medical_metaphone_index:
+            return terms
+        codes_by_term: Dict[str, List[str]] = {}
+        for mp, mp_terms in self.medical_metaphone_index.items():
+            for term in mp_terms:
+                codes_by_term.setdefault(term, []).append(mp)
+        return [[term, codes_by_term.get(term, [])] for term in terms]
+
+    def _build_medical_ngram_heads(self) -> None:
+        """Collect the leading token of lexicon keys longer than one token.
+
+        A multi-token n-gram can only equal a key whose first token is its own
+        first token, so apply_medical_corrections skips the n > 1 probes for
+        any token outside this set (i.e. most ordinary words).
+        """
+        heads: Set[str] = set()
+        for term_lower in self.medical_terms_set:
+            head = _MEDICAL_TOKEN_RE.match(term_lower)
+            if head and head.end() < len(term_lower):
+                heads.add(head.group())
+        self._medical_ngram_heads = heads
+
+    def _medical_uses_metaphone(self) -> bool:
+        """Whether single-token fuzzy matching falls back to metaphone (no symspellpy, phonetics installed)."""
+        return not SYMSPELL_AVAILABLE and _get_phonetics() is not None
+
+    def _build_medical_fuzzy_index(self) -> None:
+        """Build the single-token fuzzy index: SymSpell when available, else metaphone buckets."""
+        if SYMSPELL_AVAILABLE:
+            self._build_medical_spell_index()
+        else:
+            self._build_medical_metaphone_buckets()
+
+    def _build_medical_metaphone_buckets(self) -> None:
+        """Split each metaphone's term list by first letter and length.
+
+        The fuzzy medical match only accepts candidates sharing the token's
+        first letter and within 3 characters of its length, so lookups can go
+        straight to those buckets instead of filtering the whole metaphone list.
+        """
+        buckets: Dict[Tuple[str, str, int], List[Tuple[int, str]]] = {}
+        for mp, terms in self.medical_metaphone_index.items():
+            for position, term in enumerate(terms):
+                buckets.setdefault((mp, term[0].lower(), len(term)), []).append((position, term))
+        self._medical_metaphone_buckets = buckets
+
+    def _metaphone_candidates(self, mp: str, first_letter: str, length: int) -> List[str]:
+        """Terms under ``mp`` with the given first letter and a length within 3, in index order."""
+        entries: List[Tuple[int, str]] = []
+        for cand_len in range(max(1, length - 3), length + 4):
+            entries.extend(self._medical_metaphone_buckets.get((mp, first_letter, cand_len), ()))
+        entries.sort()
+        return [term for _, term in entries]
+
+    def _build_medical_spell_index(self) -> None:
+        """Index the lexicon for edit-distance lookups (up to 2 edits) when symspellpy is available."""
+        if not SYMSPELL_AVAILABLE or not self.medical_canonical_map:
+            return
+        symspell = SymSpell(max_dictionary_edit_distance=2, prefix_length=7)
+        for term_lower in self.medical_canonical_map:
+            symspell.create_dictionary_entry(term_lower, 1)
+        self._medical_symspell = symspell
+
     def _normalize_term(self, term: str) -> str:
         """Normalization for lexicon keys."""
-        return re.sub(r"\s+", " ", term.strip()).lower()
+        return _WHITESPACE_RE.sub(" ", term.strip()).lower()
 
     def _double_metaphone_all(self, term: str) -> List[str]:
-        if not PHONETICS_AVAILABLE:
-            return []
-        try:
-            code1, code2 = phonetics.dmetaphone(term)
-            results = []
-            if code1:
-                results.append(code1)
-            if code2 and code2 != code1:
-                results.append(code2)
-            return results
-        except Exception:
-            return []
+        """Double-metaphone codes for a dictated token (memoized across calls)."""
+        return list(_cached_dmetaphone_codes(term))
 
     def _load_medical_lexicon_from_fda_products(self, products_path: str) -> int:
         """Parse FDA Products.txt (tab-delimited) and build a medical terms index.
 
         We index both brand names (DrugName) and active ingredients (ActiveIngredient).
+        Rows are streamed straight into the maps; the first spelling seen for a
+        normalized term becomes its canonical form.
         """
-        unique_terms: Set[str] = set()
+        use_metaphone = self._medical_uses_metaphone()
 
-        with open(products_path, 'r', encoding='utf-8', errors='ignore') as f:
-            reader = csv.DictReader(f, delimiter='\t')
+        def add_term(term: str) -> None:
+            norm = self._normalize_term(term)
+            if norm not in self.medical_canonical_map:
+                self.medical_canonical_map[norm] = term
+                self.medical_terms_set.add(norm)
+                if use_metaphone:
+                    for mp in _dmetaphone_codes(term):
+                        self.medical_metaphone_index.setdefault(mp, []).append(term)
+
+        if _get_polars() is not None:
+            for term in _fda_product_terms_polars(products_path):
+                add_term(term)
+            return len(self.medical_terms_set)
+
+        with open(products_path, 'r', encoding='utf-8', errors='ignore', buffering=1 << 20) as f:
+            reader = csv.reader(f, delimiter='\t')
+            header = next(reader, [])
+            drug_idx = header.index('DrugName')
+            ing_idx = header.index('ActiveIngredient')
             for row in reader:
-                drug_name = (row.get('DrugName') or '').strip()
-                active_ing = (row.get('ActiveIngredient') or '').strip()
+                drug_name = row[drug_idx].strip() if drug_idx < len(row) else ''
+                active_ing = row[ing_idx].strip() if ing_idx < len(row) else ''
 
                 # Add brand name
                 if drug_name and drug_name.upper() != 'UNKNOWN':
-                    unique_terms.add(drug_name)
+                    add_term(drug_name)
                 # Add active ingredients, possibly multiple separated by ';'
                 if active_ing and active_ing.upper() != 'UNKNOWN':
                     # Split on separators like ';' and parentheses content
-                    parts = [p.strip() for p in re.split(r"[;,+]", active_ing) if p.strip()]
+                    parts = [p.strip() for p in _INGREDIENT_SPLIT_RE.split(active_ing) if p.strip()]
                     if parts:
                         for p in parts:
                             # Remove composite descriptors like contents in parentheses
-                            cleaned = re.sub(r"\([^\)]*\)", "", p).strip()
+                            cleaned = _PARENTHESIZED_RE.sub("", p).strip()
                             if cleaned:
-                                unique_terms.add(cleaned)
+                                add_term(cleaned)
                     else:
-                        unique_terms.add(active_ing)
-
-        # Build maps
-        for term in unique_terms:
-            norm = self._normalize_term(term)
-            if norm not in self.medical_canonical_map:
-                self.medical_canonical_map[norm] = term
-                self.medical_terms_set.add(norm)
-                for mp in self._double_metaphone_all(term):
-                    if mp:
-                        self.medical_metaphone_index.setdefault(mp, []).append(term)
+                        add_term(active_ing)
 
         return len(self.medical_terms_set)
     
@@ -242,14 +963,20 @@ class VocabularyManager:
         
         # Store with category prefix for organization
         key = f"{category}:{correct_term.lower()}"
+        replacing = key in self.custom_terms
         self.custom_terms[key] = {
             'correct': correct_term,
             'variations': variations,
             'category': category,
-            'added_date': datetime.now().isoformat(),
+            'added_ts': int(time.time()),
             'usage_count': 0
         }
         
+        if replacing:
+            # The old entry's variations must leave the index; only a full rebuild can do that
+            self.rebuild_corrections_index()
+        else:
+            self._extend_corrections_index(key, variations, new_term=True)
         self.save_vocabulary()
         print(f"[VOCAB] Added term: {correct_term} with {len(variations)} variations")
     
@@ -263,30 +990,44 @@ class VocabularyManager:
             'original': original,
             'corrected': corrected,
             'context': context,
-            'timestamp': datetime.now().isoformat(),
+            'ts': int(time.time()),  # Unix seconds; legacy entries carry an ISO 'timestamp'
             'confidence': self._calculate_confidence(original, corrected)
         }
         
-        self.correction_history.append(correction_entry)
+        self._append_correction(correction_entry)
+        self._vocab_version += 1  # Correction and pattern counts feed the stats
         
         # Update learning patterns
         pattern_key = f"{original.lower()} -> {corrected.lower()}"
-        self.learning_patterns[pattern_key] = self.learning_patterns.get(pattern_key, 0) + 1
+        count = self._count_pattern(pattern_key)
         
         # If this correction appears frequently, add it as a custom term
-        if self.learning_patterns[pattern_key] >= 2:  # After 2 corrections, make it permanent
+        if count >= 2:  # After 2 corrections, make it permanent
             self._promote_to_custom_term(original, corrected)
         
-        self.save_corrections()
-        self.save_vocabulary()
+        self._mark_dirty(vocabulary=True)
         
-        print(f"[VOCAB] Learned correction: '{original}' → '{corrected}' (count: {self.learning_patterns[pattern_key]})")
+        print(f"[VOCAB] Learned correction: '{original}' → '{corrected}' (count: {count})")
         return True
+
+    def _count_pattern(self, pattern_key: str) -> int:
+        """Increment a learning pattern and move it to the most-recent end; returns the new count."""
+        count = self.learning_patterns.pop(pattern_key, 0) + 1
+        self.learning_patterns[pattern_key] = count
+        self._trim_learning_patterns()
+        return count
+
+    def _trim_learning_patterns(self) -> None:
+        """Drop the least recently seen patterns beyond LEARNING_PATTERNS_MAX."""
+        excess = len(self.learning_patterns) - self.LEARNING_PATTERNS_MAX
+        if excess <= 0:
+            return
+        for pattern_key in list(itertools.islice(self.learning_patterns, excess)):
+            del self.learning_patterns[pattern_key]
     
     def _calculate_confidence(self, original: str, corrected: str) -> float:
         """Calculate confidence score for a correction based on similarity."""
-        similarity = difflib.SequenceMatcher(None, original.lower(), corrected.lower()).ratio()
-        return round(similarity, 2)
+        return _similarity_confidence(original, corrected)
     
     def _promote_to_custom_term(self, original: str, corrected: str) -> None:
         """Promote a frequently corrected term to custom vocabulary."""
@@ -294,77 +1035,274 @@ class VocabularyManager:
         category = self._categorize_term(corrected)
         
         # Check if we already have this term
-        existing_key = None
-        for key, term_data in self.custom_terms.items():
-            if term_data['correct'].lower() == corrected.lower():
-                existing_key = key
-                break
+        existing_key = self._correct_lower_keys.get(corrected.lower())
         
         if existing_key:
             # Add to existing variations
             if original not in self.custom_terms[existing_key]['variations']:
                 self.custom_terms[existing_key]['variations'].append(original)
+                self._extend_corrections_index(existing_key, [original])
+                self._mark_dirty(vocabulary=True)
         else:
             # Create new term
             self.add_custom_term(corrected, [original], category)
     
     def _categorize_term(self, term: str) -> str:
         """Attempt to categorize a term based on patterns."""
-        term_lower = term.lower()
-        
-        # Technical/medication patterns
-        if any(suffix in term_lower for suffix in ['mycin', 'cillin', 'phen', 'zole', 'pine']):
-            return "medication"
-        
-        # Professional titles
-        if term.startswith(('Dr.', 'Doctor', 'Mr.', 'Mrs.', 'Ms.', 'Prof.', 'Professor')):
-            return "names"
-        
-        # Technical procedures/conditions (common suffixes and specific terms)
-        technical_patterns = ['itis', 'osis', 'emia', 'pathy', 'gram', 'scopy', 'monia', 'thorax', 'tension']
-        if any(suffix in term_lower for suffix in technical_patterns):
-            return "technical_terms"
-        
-        return "general"
+        return _categorize(term)
     
+    def rebuild_corrections_index(self) -> None:
+        """Rebuild the variation index (Aho-Corasick automaton or regex) used by apply_corrections.
+
+        Must be called whenever custom terms or their variations change.
+        """
+        variation_keys: Dict[str, str] = {}
+        for key, term_data in self.custom_terms.items():
+            for variation in term_data['variations']:
+                variation_lower = variation.lower()
+                # First term wins when two terms share a variation
+                if variation_lower and variation_lower not in variation_keys:
+                    variation_keys[variation_lower] = key
+        self._variation_keys = variation_keys
+        self.correct_lower_index = {
+            key: term_data['correct'].lower() for key, term_data in self.custom_terms.items()
+        }
+        self._correct_lower_keys = {}
+        for key, correct_lower in self.correct_lower_index.items():
+            self._correct_lower_keys.setdefault(correct_lower, key)
+        self._term_choice_data = list(self.custom_terms.values())
+        self._term_choices = list(self.correct_lower_index.values())
+        self._by_category = {}
+        for key, term_data in self.custom_terms.items():
+            self._by_category.setdefault(term_data['category'], []).append(key)
+        self._vocab_version += 1
+        self._min_variation_len = min(map(len, variation_keys), default=0)
+        self._single_token_variations = bool(variation_keys) and all(
+            _WORD_TOKEN_RE.fullmatch(v) for v in variation_keys
+        )
+        self._corrections_regex = None
+        self._corrections_automaton = None
+        if not variation_keys:
+            return
+        if not AHOCORASICK_AVAILABLE:
+            # Regex is the primary path: compile now rather than on the next dictation
+            self._corrections_regex = self._variation_regex()
+            return
+
+        automaton = ahocorasick.Automaton()
+        for variation_lower, key in variation_keys.items():
+            automaton.add_word(variation_lower, (len(variation_lower), key))
+        automaton.make_automaton()
+        self._corrections_automaton = automaton
+
+    def _extend_corrections_index(self, key: str, variations: List[str], new_term: bool = False) -> None:
+        """Add one term's variations to the live index without rebuilding it from scratch.
+
+        Only valid for additions; edits and removals need rebuild_corrections_index().
+        """
+        if new_term:
+            term_data = self.custom_terms[key]
+            correct_lower = term_data['correct'].lower()
+            self.correct_lower_index[key] = correct_lower
+            self._correct_lower_keys.setdefault(correct_lower, key)
+            self._term_choice_data.append(term_data)
+            self._term_choices.append(correct_lower)
+            self._by_category.setdefault(term_data['category'], []).append(key)
+        self._vocab_version += 1
+
+        added = []
+        for variation in variations:
+            variation_lower = variation.lower()
+            # First term wins when two terms share a variation
+            if variation_lower and variation_lower not in self._variation_keys:
+                self._variation_keys[variation_lower] = key
+                added.append(variation_lower)
+        if not added:
+            return
+        shortest = min(map(len, added))
+        self._min_variation_len = min(self._min_variation_len, shortest) if self._min_variation_len else shortest
+        self._single_token_variations = (
+            len(self._variation_keys) == len(added) or self._single_token_variations
+        ) and all(_WORD_TOKEN_RE.fullmatch(v) for v in added)
+
+        self._corrections_regex = None
+        if not AHOCORASICK_AVAILABLE:
+            self._corrections_regex = self._variation_regex()
+            return
+        if self._corrections_automaton is None:
+            self._corrections_automaton = ahocorasick.Automaton()
+        for variation_lower in added:
+            self._corrections_automaton.add_word(variation_lower, (len(variation_lower), key))
+        # Only recomputes failure links; existing trie nodes are kept
+        self._corrections_automaton.make_automaton()
+
+    def _apply_corrections_automaton(self, text: str) -> Optional[Tuple[str, List[Dict]]]:
+        """Single-pass correction using the prebuilt automaton.
+
+        Matches must sit on word boundaries; overlapping matches resolve to the
+        leftmost, then longest variation. Returns None if the text can't be
+        scanned this way (lowercasing changed its length).
+        """
+        text_lower = text.lower()
+        if len(text_lower) != len(text):
+            return None
+
+        matches = []
+        if text.isascii():
+            # Same boundary test as _at_word_boundary, as byte-table lookups instead of str calls
+            data = text.encode('ascii')
+            size = len(data)
+            table = _WORD_BYTE_TABLE
+            for end_idx, (length, key) in self._corrections_automaton.iter(text_lower):
+                start = end_idx - length + 1
+                end = end_idx + 1
+                if (start > 0 and table[data[start - 1]]) == table[data[start]]:
+                    continue
+                if table[data[end - 1]] == (end < size and table[data[end]]):
+                    continue
+                matches.append((start, end, key))
+        else:
+            for end_idx, (length, key) in self._corrections_automaton.iter(text_lower):
+                start = end_idx - length + 1
+                end = end_idx + 1
+                if _at_word_boundary(text, start) and _at_word_boundary(text, end):
+                    matches.append((start, end, key))
+        if not matches:
+            return text, []
+
+        matches.sort(key=lambda m: (m[0], m[0] - m[1]))
+        pieces: List[str] = []
+        applied_corrections: List[Dict] = []
+        used_keys: List[str] = []
+        cursor = 0
+        for start, end, key in matches:
+            if start < cursor:
+                continue
+            term_data = self.custom_terms[key]
+            original = text[start:end]
+            replacement = self._preserve_case(original, term_data['correct'])
+            pieces.append(text[cursor:start])
+            pieces.append(replacement)
+            cursor = end
+
+            applied_corrections.append({
+                'original': original,
+                'corrected': replacement,
+                'position': start,
+                'category': term_data['category']
+            })
+            used_keys.append(key)
+        pieces.append(text[cursor:])
+        self._record_usage(used_keys)
+        return "".join(pieces), applied_corrections
+
     def apply_corrections(self, text: str) -> Tuple[str, List[Dict]]:
         """Apply vocabulary corrections to text and return corrected text + correction info."""
-        corrected_text = text
-        applied_corrections = []
-        
-        for key, term_data in self.custom_terms.items():
-            correct_term = term_data['correct']
-            variations = term_data['variations']
-            
-            for variation in variations:
-                if variation.lower() in corrected_text.lower():
-                    # Use regex for whole word replacement
-                    pattern = r'\b' + re.escape(variation) + r'\b'
-                    matches = list(re.finditer(pattern, corrected_text, re.IGNORECASE))
-                    
-                    for match in reversed(matches):  # Reverse to maintain positions
-                        # Replace while preserving original case pattern
-                        replacement = self._preserve_case(match.group(), correct_term)
-                        corrected_text = corrected_text[:match.start()] + replacement + corrected_text[match.end():]
-                        
-                        applied_corrections.append({
-                            'original': match.group(),
-                            'corrected': replacement,
-                            'position': match.start(),
-                            'category': term_data['category']
-                        })
-                        
-                        # Update usage count
-                        self.custom_terms[key]['usage_count'] += 1
+        if not text or text.isspace():
+            return text, []
+
+        result = None
+        if len(text) < self._min_variation_len:
+            # Shorter than every variation, so no custom term can match
+            result = text, []
+        elif self._single_token_variations:
+            result = self._apply_corrections_tokens(text)
+        elif self._corrections_automaton is not None:
+            result = self._apply_corrections_automaton(text)
+        if result is not None:
+            corrected_text, applied_corrections = result
+        else:
+            corrected_text, applied_corrections = self._apply_corrections_regex(text)
         
         if applied_corrections:
-            self.save_vocabulary()  # Save updated usage counts
+            # Usage counts changed; coalesced into an occasional save (flush() always writes them)
+            self._pending_usage_delta += len(applied_corrections)
+            if (self._pending_usage_delta >= self.USAGE_FLUSH_THRESHOLD
+                    or time.monotonic() - self._last_flush >= self.USAGE_FLUSH_INTERVAL_SECONDS):
+                self._schedule_flush()
         
         # After custom-term corrections, try medical lexicon corrections for remaining tokens
         med_corrected, med_corrections = self.apply_medical_corrections(corrected_text)
         applied_corrections.extend(med_corrections)
         return med_corrected, applied_corrections
 
+    def _apply_corrections_tokens(self, text: str) -> Tuple[str, List[Dict]]:
+        """Correction by per-token dict lookup, used while every variation is a single word.
+
+        Splitting on \\W+ yields exactly the runs a \\b-bounded single-word
+        variation can match, so this gives the same result as the automaton
+        and regex paths in time linear in the text.
+        """
+        tokens = _TOKEN_SPLIT_RE.split(text)
+        applied_corrections: List[Dict] = []
+        used_keys: List[str] = []
+        position = 0
+        # Word tokens sit at even indices; separators at odd ones
+        for index, token in enumerate(tokens):
+            if index % 2 == 0 and token:
+                key = self._variation_keys.get(token.lower())
+                if key is not None:
+                    term_data = self.custom_terms[key]
+                    replacement = self._preserve_case(token, term_data['correct'])
+                    tokens[index] = replacement
+                    applied_corrections.append({
+                        'original': token,
+                        'corrected': replacement,
+                        'position': position,
+                        'category': term_data['category']
+                    })
+                    used_keys.append(key)
+            position += len(token)
+        if not applied_corrections:
+            return text, []
+        self._record_usage(used_keys)
+        return "".join(tokens), applied_corrections
+
+    def _variation_regex(self) -> "re.Pattern":
+        """Combined regex over the current variations (longest first, ties in stable order)."""
+        return _compile_variation_regex(
+            tuple(sorted(self._variation_keys, key=lambda v: (-len(v), v)))
+        )
+
+    def _apply_corrections_regex(self, text: str) -> Tuple[str, List[Dict]]:
+        """Single-pass regex fallback used when the automaton is unavailable.
+
+        One precompiled alternation with the longest variations first, so each
+        position takes the longest whole-word match, like the automaton path.
+        """
+        if not self._variation_keys:
+            return text, []
+        if self._corrections_regex is None:
+            # Only reached with the automaton available, for text whose length changes when lowercased
+            self._corrections_regex = self._variation_regex()
+
+        pieces: List[str] = []
+        applied_corrections: List[Dict] = []
+        used_keys: List[str] = []
+        cursor = 0
+        for match in self._corrections_regex.finditer(text):
+            key = self._variation_keys.get(match.group().lower())
+            if key is None:
+                continue
+            term_data = self.custom_terms[key]
+            # Replace while preserving original case pattern
+            replacement = self._preserve_case(match.group(), term_data['correct'])
+            pieces.append(text[cursor:match.start()])
+            pieces.append(replacement)
+            cursor = match.end()
+
+            applied_corrections.append({
+                'original': match.group(),
+                'corrected': replacement,
+                'position': match.start(),
+                'category': term_data['category']
+            })
+            # Update usage count (merged into the term on the next read or flush)
+            used_keys.append(key)
+        pieces.append(text[cursor:])
+        self._record_usage(used_keys)
+        return "".join(pieces), applied_corrections
+
     def apply_medical_corrections(self, text: str) -> Tuple[str, List[Dict]]:
         """Use the medical lexicon to correct likely drug names using exact and fuzzy matching.
 
@@ -374,18 +1312,17 @@ class VocabularyManager:
         if not self.medical_terms_set:
             return text, []
 
-        tokens = list(re.finditer(r"[A-Za-z][A-Za-z\-']*", text))
+        tokens = list(_MEDICAL_TOKEN_RE.finditer(text))
+        token_lowers = [token.group().lower() for token in tokens]
         corrections: List[Dict] = []
 
         # Consider n-grams up to 3 tokens
         ngram_max = 3
-        text_out = text
 
         # We'll collect replacement operations as (start, end, replacement)
         replacements: List[Tuple[int, int, str]] = []
 
-        def confidence(a: str, b: str) -> float:
-            return difflib.SequenceMatcher(None, a.lower(), b.lower()).ratio()
+        use_metaphone = self._medical_uses_metaphone()
 
         i = 0
         while i < len(tokens):
@@ -393,10 +1330,13 @@ class VocabularyManager:
             for n in range(ngram_max, 0, -1):
                 if i + n > len(tokens):
                     continue
+                if n > 1 and token_lowers[i] not in self._medical_ngram_heads:
+                    continue  # No lexicon key of more than one token starts with this word
                 start = tokens[i].start()
                 end = tokens[i + n - 1].end()
                 original = text[start:end]
-                norm = self._normalize_term(original)
+                # A single token has no whitespace, so its normalized form is just its lowercase
+                norm = token_lowers[i] if n == 1 else self._normalize_term(original)
 
                 # Exact lexicon match (case-insensitive)
                 if norm in self.medical_terms_set:
@@ -404,13 +1344,19 @@ class VocabularyManager:
                     best = (1.0, start, end, candidate, original)
                     break  # Exact match is best for this n-gram
 
-                # Fuzzy via metaphone if single token or short phrase
-                if n == 1 and PHONETICS_AVAILABLE:
-                    mps = self._double_metaphone_all(original)
+                # Fuzzy via SymSpell (or metaphone) if single token
+                if n == 1 and (self._medical_symspell is not None or use_metaphone):
                     candidate_pool: List[str] = []
-                    for mp in mps:
-                        if mp and mp in self.medical_metaphone_index:
-                            candidate_pool.extend(self.medical_metaphone_index[mp])
+                    if self._medical_symspell is not None:
+                        # Bounded edit-distance lookup instead of scanning a metaphone bucket
+                        for suggestion in self._medical_symspell.lookup(
+                            original.lower(), Verbosity.CLOSEST, max_edit_distance=2
+                        ):
+                            candidate_pool.append(self.medical_canonical_map[suggestion.term])
+                    else:
+                        first_letter = original[0].lower()
+                        for mp in self._double_metaphone_all(original):
+                            candidate_pool.extend(self._metaphone_candidates(mp, first_letter, len(original)))
                     # Deduplicate
                     seen = set()
                     filtered: List[str] = []
@@ -419,28 +1365,24 @@ class VocabularyManager:
                             seen.add(c)
                             filtered.append(c)
                     # Evaluate best by high similarity, filter by first-letter heuristic and length
-                    original_l = original.lower()
-                    for cand in filtered:
-                        if abs(len(cand) - len(original)) > 3:
-                            continue
-                        if cand[0].lower() != original_l[0]:
-                            continue
-                        score = confidence(original, cand)
-                        if score >= 0.92:
-                            # High-confidence correction
-                            best = (score, start, end, cand, original)
-                            break
+                    match = _first_confident_candidate(original, filtered, 0.92)
+                    if match is not None:
+                        # High-confidence correction
+                        index, score = match
+                        best = (score, start, end, filtered[index], original)
                 if best:
                     break
 
             if best:
                 score, start, end, cand, original = best
                 # Avoid no-op
-                if original.lower() != cand.lower():
-                    replacements.append((start, end, self._preserve_case(original, cand)))
+                # Skip matches overlapping an earlier replacement (n-grams advance one token at a time)
+                if original.lower() != cand.lower() and (not replacements or start >= replacements[-1][1]):
+                    replacement = self._preserve_case(original, cand)
+                    replacements.append((start, end, replacement))
                     corrections.append({
                         'original': original,
-                        'corrected': self._preserve_case(original, cand),
+                        'corrected': replacement,
                         'position': start,
                         'category': 'medication'
                     })
@@ -452,57 +1394,128 @@ class VocabularyManager:
         if not replacements:
             return text, []
 
-        # Apply replacements back-to-front to preserve indices
-        replacements.sort(key=lambda x: x[0], reverse=True)
+        # Replacements are in ascending, non-overlapping order: stitch the output in one pass
+        pieces: List[str] = []
+        cursor = 0
         for start, end, rep in replacements:
-            text_out = text_out[:start] + rep + text_out[end:]
-
-        return text_out, corrections
+            pieces.append(text[cursor:start])
+            pieces.append(rep)
+            cursor = end
+        pieces.append(text[cursor:])
+        return "".join(pieces), corrections
     
     def _preserve_case(self, original: str, replacement: str) -> str:
         """Preserve the case pattern of the original when replacing."""
-        if original.isupper():
-            return replacement.upper()
-        elif original.islower():
-            return replacement.lower()
-        elif original.istitle():
-            return replacement.title()
-        else:
-            return replacement
+        return _apply_case(_case_class(original), replacement)
     
     def suggest_corrections(self, text: str, max_suggestions: int = 3) -> List[Dict]:
         """Suggest possible corrections for text based on learned patterns."""
+        self._merge_usage_deltas()
         suggestions = []
         words = text.split()
-        
-        for word in words:
-            # Find close matches in our vocabulary
-            best_matches = difflib.get_close_matches(
-                word.lower(), 
-                [term_data['correct'].lower() for term_data in self.custom_terms.values()],
-                n=max_suggestions,
-                cutoff=0.6
-            )
-            
-            for match in best_matches:
-                # Find the original term data
-                for term_data in self.custom_terms.values():
-                    if term_data['correct'].lower() == match:
-                        suggestions.append({
-                            'original': word,
-                            'suggested': term_data['correct'],
-                            'confidence': difflib.SequenceMatcher(None, word.lower(), match).ratio(),
-                            'category': term_data['category'],
-                            'usage_count': term_data['usage_count']
-                        })
-                        break
+        if not words or not self._term_choices or max_suggestions <= 0:
+            return suggestions
+
+        words_lower = [word.lower() for word in words]
+        for word, matches in zip(words, self._close_term_matches(words_lower, max_suggestions)):
+            for term_data, confidence in matches:
+                suggestions.append({
+                    'original': word,
+                    'suggested': term_data['correct'],
+                    'confidence': confidence,
+                    'category': term_data['category'],
+                    'usage_count': term_data['usage_count']
+                })
         
         # Sort by confidence and usage
         suggestions.sort(key=lambda x: (x['confidence'], x['usage_count']), reverse=True)
         return suggestions[:max_suggestions]
     
+    def _close_term_matches(self, words_lower: List[str], limit: int) -> List[List[Tuple[Dict, float]]]:
+        """For each word, up to ``limit`` (term data, similarity) pairs scoring at least 0.6, best first."""
+        if not RAPIDFUZZ_AVAILABLE:
+            results = []
+            for word_lower in words_lower:
+                matches = []
+                for match in difflib.get_close_matches(
+                    word_lower, self._term_choices, n=limit, cutoff=0.6
+                ):
+                    term_data = self._term_choice_data[self._term_choices.index(match)]
+                    matches.append(
+                        (term_data, difflib.SequenceMatcher(None, word_lower, match).ratio())
+                    )
+                results.append(matches)
+            return results
+
+        # One call scores every (word, term) pair; scores under the cutoff come back as 0.
+        # Large matrices are split across all cores; small ones aren't worth the thread startup.
+        workers = -1 if len(words_lower) * len(self._term_choices) >= self.SUGGEST_PARALLEL_MIN_PAIRS else 1
+        scores = fuzz_cdist(words_lower, self._term_choices, scorer=fuzz.ratio, score_cutoff=60,
+                            dtype=np.float64, workers=workers)
+        term_count = scores.shape[1]
+        if limit < term_count:
+            top = np.argpartition(-scores, limit - 1, axis=1)[:, :limit]
+        else:
+            top = np.broadcast_to(np.arange(term_count), scores.shape)
+        results = []
+        for row_scores, row_top in zip(scores, top):
+            ranked = sorted(row_top.tolist(), key=lambda index: (-row_scores[index], index))
+            results.append([
+                (self._term_choice_data[index], float(row_scores[index]) / 100.0)
+                for index in ranked if row_scores[index] >= 60
+            ])
+        return results
+
+    def list_terms(self, search_filter: str = "", category_filter: str = "") -> List[Dict]:
+        """Return matching terms, most used first, then alphabetically.
+
+        Results are cached per filter until the vocabulary or its usage counts change.
+        A category filter only visits that category's terms.
+        """
+        self._merge_usage_deltas()
+        if self._term_list_cache_version != self._vocab_version:
+            self._term_list_cache = {}
+            self._term_list_cache_version = self._vocab_version
+        search_lower = search_filter.lower()
+        cache_key = (search_lower, category_filter)
+        cached = self._term_list_cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+
+        if category_filter:
+            keys = self._by_category.get(category_filter, [])
+        else:
+            keys = self.custom_terms.keys()
+        rows = []
+        for key in keys:
+            term_data = self.custom_terms.get(key)
+            # Skip keys whose term was deleted or recategorized without a rebuild
+            if term_data is None or (category_filter and term_data['category'] != category_filter):
+                continue
+            correct_lower = self.correct_lower_index.get(key) or term_data['correct'].lower()
+            if search_lower and search_lower not in correct_lower:
+                continue
+            rows.append((-term_data['usage_count'], correct_lower, {
+                'key': key,
+                'correct': term_data['correct'],
+                'variations': term_data['variations'],
+                'category': term_data['category'],
+                'usage_count': term_data['usage_count'],
+                'added_date': _format_timestamp(term_data.get('added_ts', 0))
+            }))
+        rows.sort(key=lambda row: row[:2])
+        terms = [row[2] for row in rows]
+        self._term_list_cache[cache_key] = terms
+        return list(terms)
+
     def get_vocabulary_stats(self) -> Dict:
-        """Get statistics about the vocabulary system."""
+        """Get statistics about the vocabulary system (cached until the vocabulary changes)."""
+        self._merge_usage_deltas()
+        if self._stats_cache_version == self._vocab_version:
+            return dict(self._stats_cache, categories=dict(self._stats_cache['categories']))
+
+        if self._correction_history is None:
+            self.load_corrections()  # also counts the log's entries
         categories = {}
         total_usage = 0
         
@@ -511,16 +1524,18 @@ class VocabularyManager:
             categories[category] = categories.get(category, 0) + 1
             total_usage += term_data['usage_count']
         
-        return {
+        self._stats_cache = {
             'total_terms': len(self.custom_terms),
             'categories': categories,
-            'total_corrections': len(self.correction_history),
+            'total_corrections': self._correction_total,
             'total_usage': total_usage,
             'learning_patterns': len(self.learning_patterns)
         }
+        self._stats_cache_version = self._vocab_version
+        return dict(self._stats_cache, categories=dict(categories))
     
-    def export_vocabulary(self, filepath: str) -> bool:
-        """Export vocabulary to a shareable file."""
+    def export_vocabulary(self, filepath: str, binary: bool = False) -> bool:
+        """Export vocabulary to a shareable file (msgpack when ``binary`` or the path ends in .msgpack)."""
         try:
             export_data = {
                 'vocabulary_export': {
@@ -530,8 +1545,13 @@ class VocabularyManager:
                 }
             }
             
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(export_data, f, indent=2, ensure_ascii=False)
+            if binary or _is_msgpack_path(filepath):
+                if not MSGPACK_AVAILABLE:
+                    raise RuntimeError("msgpack is not installed; cannot write a binary export")
+                with open(filepath, 'wb') as f:
+                    f.write(msgpack.packb(export_data, use_bin_type=True))
+            else:
+                _write_json(filepath, export_data)
             
             print(f"[VOCAB] Exported vocabulary to {filepath}")
             return True
@@ -542,10 +1562,8 @@ class VocabularyManager:
     def import_vocabulary(self, filepath: str, merge: bool = True) -> bool:
         """Import vocabulary from a file."""
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            imported_terms = data.get('vocabulary_export', {}).get('terms', {})
+            imported_terms = _read_vocabulary_export(filepath)
+            _migrate_term_timestamps(imported_terms)
             
             if merge:
                 # Merge with existing vocabulary
@@ -554,6 +1572,7 @@ class VocabularyManager:
                 # Replace existing vocabulary
                 self.custom_terms = imported_terms
             
+            self.rebuild_corrections_index()
             self.save_vocabulary()
             print(f"[VOCAB] Imported {len(imported_terms)} terms from {filepath}")
             return True
@@ -25,6 +25,17 @@ from typing import Dict, List, Optional, Any
 from unittest.mock import Mock, MagicMock, patch
 
 
+# Fake wall clock for the tests: every time.time() call advances it by a microsecond
+_fake_now = 1_000_000.0
+
+
+def _tick() -> float:
+    """Stand-in for time.time() that never goes backwards and never hits the real clock"""
+    global _fake_now
+    _fake_now += 1e-6
+    return _fake_now
+
+
 class MockAudioInput:
     """Mock audio input for integration testing"""
 
@@ -278,7 +289,6 @@ class IntegratedDictationWorkflow:
                     full_transcription
                 ):
                     self.frontend.stream_llm_response(token_data["token"])
-                    time.sleep(0.001)  # Simulate streaming delay (reduced)
 
                 llm_result = self.frontend.displayed_content
             else:
@@ -331,9 +341,14 @@ class TestEndToEndDictation(unittest.TestCase):
         os.makedirs(self.vosk_model_path, exist_ok=True)
         os.makedirs(self.llm_model_path, exist_ok=True)
 
+        # One patch covers every time.time() call in the mocks and the workflow
+        self._time_patch = patch("time.time", _tick)
+        self._time_patch.start()
+
     def tearDown(self):
         import shutil
 
+        self._time_patch.stop()
         shutil.rmtree(self.temp_dir, ignore_errors=True)
 
     def test_basic_dictation_workflow(self):
@@ -0,0 +1,570 @@
+"""
+Unit tests for TranscriptionHandler with the ASR backends mocked out
+"""
+
+import io
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+import wave
+from types import SimpleNamespace
+from unittest.mock import MagicMock, Mock, patch
+
+import numpy as np
+
+try:
+    import pyaudio  # noqa: F401
+    _pyaudio_stubbed = False
+except ImportError:
+    # src/config/config.py imports pyaudio (PortAudio) only for the int16 format constant;
+    # stub it for this import so the handler can be tested on machines without audio hardware
+    sys.modules["pyaudio"] = SimpleNamespace(paInt16=8, get_sample_size=lambda fmt: 2)
+    _pyaudio_stubbed = True
+
+try:
+    import src.transcription_handler as transcription_handler
+    from src.transcription_handler import (
+        TranscriptionHandler,
+        _int16_to_float32,
+        _wav_fmt_chunk,
+        _wav_header,
+    )
+except ImportError:
+    transcription_handler = None
+finally:
+    if _pyaudio_stubbed:
+        # Other test modules must still see pyaudio, and the config built on the stub, as missing
+        for name in ("pyaudio", "src.config.config", "src.config"):
+            sys.modules.pop(name, None)
+
+_requires_handler = unittest.skipIf(transcription_handler is None, "TranscriptionHandler not available for testing")
+
+
+def _make_handler(test, model="mlx-community/whisper-large-v3-turbo", **kwargs):
+    """Light-mode handler with a stub vocabulary manager; closed when the test ends."""
+    vocab_manager = Mock()
+    vocab_manager.apply_corrections.side_effect = lambda text: (text, [])
+    with patch.dict(os.environ, {"CT_LIGHT_MODE": "1"}), \
+            patch.object(transcription_handler, "get_vocabulary_manager", return_value=vocab_manager):
+        handler = TranscriptionHandler(selected_asr_model=model, **kwargs)
+    test.addCleanup(handler.close)
+    return handler
+
+
+@_requires_handler
+class TestWavHeader(unittest.TestCase):
+    """Test the struct-packed WAV header against the standard library writer."""
+
+    def _wave_bytes(self, pcm, channels, sample_rate, sample_width):
+        buf = io.BytesIO()
+        with wave.open(buf, "wb") as wav:
+            wav.setnchannels(channels)
+            wav.setsampwidth(sample_width)
+            wav.setframerate(sample_rate)
+            wav.writeframes(pcm)
+        return buf.getvalue()
+
+    def test_header_matches_wave_module(self):
+        """Test that the header bytes equal what the wave module writes for the same format."""
+        for channels, sample_rate, sample_width, frames in [(1, 16000, 2, 1600), (2, 44100, 2, 441), (1, 8000, 1, 0)]:
+            with self.subTest(channels=channels, sample_rate=sample_rate, sample_width=sample_width):
+                pcm = bytes(range(256)) * (frames * channels * sample_width // 256) \
+                    + bytes(frames * channels * sample_width % 256)
+                expected = self._wave_bytes(pcm, channels, sample_rate, sample_width)
+                header = _wav_header(len(pcm), _wav_fmt_chunk(channels, sample_rate, sample_width))
+
+                self.assertEqual(len(header), 44)
+                self.assertEqual(header + pcm, expected)
+
+    def test_saved_temp_audio_reads_back_with_wave(self):
+        """Test that _save_temp_audio writes a file the wave module reads back unchanged."""
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        handler = _make_handler(self)
+        handler._temp_folder = temp_dir
+        samples = (np.arange(1600, dtype=np.int16) * 17).astype(np.int16)
+
+        filename = handler._save_temp_audio(samples)
+
+        with wave.open(filename, "rb") as wav:
+            self.assertEqual(wav.getnchannels(), handler._channels)
+            self.assertEqual(wav.getframerate(), handler._sample_rate)
+            self.assertEqual(wav.getsampwidth(), handler._sample_width)
+            self.assertEqual(wav.readframes(wav.getnframes()), samples.tobytes())
+
+
+@_requires_handler
+class TestPrepareLocalModelCopy(unittest.TestCase):
+    """Test where _prepare_local_model_copy finds or downloads model files."""
+
+    REPO = "openai/whisper-small"
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.handler = _make_handler(self, model=self.REPO)
+        self.snapshot_dir = os.path.join(self.temp_dir, "hf-cache", "snapshots", "abc123")
+        os.makedirs(self.snapshot_dir)
+        self._touch(self.snapshot_dir, "config.json")
+        self.snapshot_download = Mock(side_effect=lambda repo_id, local_dir, **kwargs: local_dir)
+        patches = {
+            "HUGGINGFACE_HUB_AVAILABLE": True,
+            "try_to_load_from_cache": Mock(return_value=os.path.join(self.snapshot_dir, "config.json")),
+            "snapshot_download": self.snapshot_download,
+        }
+        for name, value in patches.items():
+            patcher = patch.object(transcription_handler, name, value, create=True)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        models_root = patch.object(transcription_handler.config, "MODELS_ROOT", os.path.join(self.temp_dir, "models"))
+        models_root.start()
+        self.addCleanup(models_root.stop)
+
+    def _touch(self, directory, name):
+        with open(os.path.join(directory, name), "w") as f:
+            f.write("{}")
+
+    def test_cache_snapshot_with_weights_is_used(self):
+        """Test that a complete Hugging Face cache snapshot is used without downloading."""
+        self._touch(self.snapshot_dir, "model.safetensors")
+
+        self.assertEqual(self.handler._prepare_local_model_copy(self.REPO), self.snapshot_dir)
+        self.snapshot_download.assert_not_called()
+
+    def test_cache_snapshot_without_weights_is_downloaded(self):
+        """Test that a cache snapshot holding only config.json does not count as a model."""
+        path = self.handler._prepare_local_model_copy(self.REPO)
+
+        self.assertNotEqual(path, self.snapshot_dir)
+        self.snapshot_download.assert_called()
+
+    def test_complete_models_dir_is_used(self):
+        """Test that a models/ copy with weights is returned without touching the cache or network."""
+        target_dir = os.path.join(transcription_handler.config.MODELS_ROOT, "openai", "whisper-small")
+        os.makedirs(target_dir)
+        self._touch(target_dir, "config.json")
+        self._touch(target_dir, "model.safetensors")
+
+        self.assertEqual(self.handler._prepare_local_model_copy(self.REPO), target_dir)
+        self.snapshot_download.assert_not_called()
+
+    def test_partial_models_dir_resumes_download(self):
+        """Test that an interrupted download in models/ goes to the networked download, not an offline probe."""
+        target_dir = os.path.join(transcription_handler.config.MODELS_ROOT, "openai", "whisper-small")
+        os.makedirs(target_dir)
+        self._touch(target_dir, "config.json")
+
+        self.assertEqual(self.handler._prepare_local_model_copy(self.REPO), target_dir)
+        self.snapshot_download.assert_called_once()
+        self.assertNotIn("local_files_only", self.snapshot_download.call_args.kwargs)
+
+
+@_requires_handler
+class TestShortClips(unittest.TestCase):
+    """Test that clips below _MIN_AUDIO_SECONDS skip ASR but still complete."""
+
+    def setUp(self):
+        self.results = []
+        self.handler = _make_handler(
+            self, on_transcription_complete_callback=lambda text, duration: self.results.append((text, duration))
+        )
+        self.handler._asr_strategy = Mock(return_value="hello world")
+        for name, value in (("MLX_WHISPER_AVAILABLE", True), ("log_text", Mock())):
+            patcher = patch.object(transcription_handler, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _samples(self, seconds):
+        return np.zeros(int(seconds * self.handler._sample_rate), dtype=np.int16)
+
+    def test_short_clip_fires_callback_without_asr(self):
+        """Test that a clip shorter than the minimum reports an empty result and never reaches the backend."""
+        self.handler._transcribe_thread_worker(self._samples(self.handler._MIN_AUDIO_SECONDS / 2), "prompt")
+
+        self.handler._asr_strategy.assert_not_called()
+        self.assertEqual(self.results, [("", 0.0)])
+
+    def test_minimum_length_clip_is_transcribed(self):
+        """Test that a clip of exactly the minimum length is passed to the backend."""
+        samples = self._samples(self.handler._MIN_AUDIO_SECONDS)
+
+        self.handler._transcribe_thread_worker(samples, "prompt")
+
+        self.handler._asr_strategy.assert_called_once_with(samples, None, "prompt")
+        self.assertEqual([text for text, _ in self.results], ["hello world"])
+
+
+class _PromptIds(np.ndarray):
+    """Token ids standing in for the 1-D torch tensor get_prompt_ids returns."""
+
+    def to(self, device):
+        return self
+
+
+def _prompt_ids(prompt):
+    """<|startofprev|> (id 0) followed by one id per word."""
+    return np.arange(1 + len(prompt.split())).view(_PromptIds)
+
+
+@_requires_handler
+class TestTransformersPipelineCache(unittest.TestCase):
+    """Test the Transformers pipeline LRU and the prompt-id cache evicted alongside it."""
+
+    def setUp(self):
+        self.handler = _make_handler(self, model="openai/whisper-small")
+        self.handler._hf_device, self.handler._hf_dtype = "cpu", "float32"
+        self.pipes = []
+
+        def make_pipe(*args, **kwargs):
+            pipe = Mock(return_value={"text": " transcribed "})
+            pipe.tokenizer.get_prompt_ids.side_effect = lambda prompt, return_tensors: _prompt_ids(prompt)
+            self.pipes.append(pipe)
+            return pipe
+
+        self.torch = MagicMock()
+        patches = {
+            "TRANSFORMERS_AVAILABLE": True,
+            "TORCH_AVAILABLE": True,
+            "torch": self.torch,
+            "AutoProcessor": MagicMock(),
+            "AutoModelForSpeechSeq2Seq": MagicMock(),
+            "hf_pipeline": Mock(side_effect=make_pipe),
+        }
+        for name, value in patches.items():
+            patcher = patch.object(transcription_handler, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        env = patch.dict(os.environ)
+        env.start()
+        self.addCleanup(env.stop)
+        os.environ.pop("CT_HF_QUANT", None)
+        self.audio = np.zeros(1600, dtype=np.float32)
+
+    def test_cpu_weights_stay_full_precision_by_default(self):
+        """Test that int8 quantization only happens when CT_HF_QUANT=int8 opts in."""
+        self.handler._transcribe_with_transformers_whisper(self.audio, "openai/whisper-small", "")
+        self.torch.quantization.quantize_dynamic.assert_not_called()
+
+        os.environ["CT_HF_QUANT"] = "int8"
+        self.handler._transcribe_with_transformers_whisper(self.audio, "distil-whisper/distil-small.en", "")
+        self.torch.quantization.quantize_dynamic.assert_called_once()
+
+    def test_prompt_ids_are_tokenized_once_per_model(self):
+        """Test that repeated prompts reuse the cached prompt ids."""
+        for _ in range(3):
+            text = self.handler._transcribe_with_transformers_whisper(self.audio, "openai/whisper-small", "prompt")
+
+        self.assertEqual(text, "transcribed")
+        self.assertEqual(len(self.pipes), 1)
+        self.pipes[0].tokenizer.get_prompt_ids.assert_called_once_with("prompt", return_tensors="pt")
+        prompt_ids = self.pipes[0].call_args.kwargs["generate_kwargs"]["prompt_ids"]
+        self.assertIs(prompt_ids, self.handler._hf_prompt_ids[("openai/whisper-small", "prompt")][0])
+
+    def test_token_budget_leaves_room_for_prompt(self):
+        """Test that prompt, start tokens and max_new_tokens never exceed max_target_positions."""
+        handler = self.handler
+        for prompt in ("prompt", transcription_handler.config.DEFAULT_WHISPER_PROMPT, "word " * 1000):
+            with self.subTest(prompt_words=len(prompt.split())):
+                handler._hf_prompt_ids.clear()
+                handler._transcribe_with_transformers_whisper(self.audio, "openai/whisper-small", prompt)
+                gen_kwargs = self.pipes[-1].call_args.kwargs["generate_kwargs"]
+                prompt_len = len(gen_kwargs["prompt_ids"])
+
+                self.assertLessEqual(prompt_len, handler._HF_MAX_PROMPT_TOKENS)
+                self.assertLessEqual(gen_kwargs["max_new_tokens"], handler._HF_MAX_NEW_TOKENS)
+                self.assertLessEqual(
+                    prompt_len + handler._HF_DECODER_START_TOKENS + gen_kwargs["max_new_tokens"],
+                    handler._HF_MAX_TARGET_POSITIONS,
+                )
+
+    def test_long_prompt_keeps_start_token_and_latest_words(self):
+        """Test that an over-long prompt is cut from the front, after <|startofprev|>."""
+        self.handler._transcribe_with_transformers_whisper(self.audio, "openai/whisper-small", "word " * 1000)
+
+        prompt_ids = self.pipes[0].call_args.kwargs["generate_kwargs"]["prompt_ids"]
+        self.assertEqual(prompt_ids[0], 0)
+        self.assertEqual(list(prompt_ids[-2:]), [999, 1000])
+
+    def test_no_prompt_uses_full_budget(self):
+        """Test that a call without a prompt decodes up to _HF_MAX_NEW_TOKENS."""
+        self.handler._transcribe_with_transformers_whisper(self.audio, "openai/whisper-small", "")
+
+        gen_kwargs = self.pipes[0].call_args.kwargs["generate_kwargs"]
+        self.assertNotIn("prompt_ids", gen_kwargs)
+        self.assertEqual(gen_kwargs["max_new_tokens"], self.handler._HF_MAX_NEW_TOKENS)
+
+    def test_prompt_ids_are_evicted_with_pipeline(self):
+        """Test that evicting a model's pipeline also drops its cached prompt ids."""
+        self.handler._transcribe_with_transformers_whisper(self.audio, "openai/whisper-small", "prompt")
+        self.handler._transcribe_with_transformers_whisper(self.audio, "openai/whisper-small", "other prompt")
+        self.assertEqual(len(self.handler._hf_prompt_ids), 2)
+
+        self.handler._transcribe_with_transformers_whisper(self.audio, "distil-whisper/distil-small.en", "prompt")
+
+        self.assertEqual(list(self.handler._hf_pipes), ["distil-whisper/distil-small.en"])
+        self.assertEqual(list(self.handler._hf_prompt_ids), [("distil-whisper/distil-small.en", "prompt")])
+
+        # Switching back rebuilds the pipeline and tokenizes the prompt again
+        self.handler._transcribe_with_transformers_whisper(self.audio, "openai/whisper-small", "prompt")
+        self.assertEqual(len(self.pipes), 3)
+        self.pipes[2].tokenizer.get_prompt_ids.assert_called_once()
+        self.assertEqual(list(self.handler._hf_prompt_ids), [("openai/whisper-small", "prompt")])
+
+
+@_requires_handler
+class TestHfDeviceProbe(unittest.TestCase):
+    """Test the Transformers device choice and its CT_HF_DEVICE override."""
+
+    def setUp(self):
+        self.handler = _make_handler(self, model="openai/whisper-small")
+        self.handler._fp16 = True
+        self.torch = MagicMock()
+        for name, value in (("TORCH_AVAILABLE", True), ("torch", self.torch)):
+            patcher = patch.object(transcription_handler, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _probe(self, mps_available, override=None):
+        self.torch.backends.mps.is_available.return_value = mps_available
+        env = {"CT_HF_DEVICE": override} if override is not None else {}
+        with patch.dict(os.environ, env):
+            if override is None:
+                os.environ.pop("CT_HF_DEVICE", None)
+            return self.handler._probe_hf_device()
+
+    def test_defaults_to_mps_when_available(self):
+        """Test that MPS is used in half precision when available and nothing is forced."""
+        self.assertEqual(self._probe(True), ("mps", self.torch.float16))
+        self.assertEqual(self._probe(False), ("cpu", self.torch.float32))
+
+    def test_override_forces_cpu(self):
+        """Test that CT_HF_DEVICE=cpu keeps the pipeline on the CPU in full precision."""
+        self.assertEqual(self._probe(True, " CPU "), ("cpu", self.torch.float32))
+
+    def test_override_ignored_when_unusable(self):
+        """Test that forcing MPS without MPS, or an unknown device, falls back to auto-detection."""
+        self.assertEqual(self._probe(False, "mps"), ("cpu", self.torch.float32))
+        self.assertEqual(self._probe(True, "cuda"), ("mps", self.torch.float16))
+
+
+@_requires_handler
+class TestSharedExecutor(unittest.TestCase):
+    """Test the shared transcription pool and close()."""
+
+    def test_handlers_share_one_executor(self):
+        """Test that every handler submits to the same class-level pool."""
+        first, second = _make_handler(self), _make_handler(self)
+
+        self.assertIs(first._executor, second._executor)
+        self.assertIs(first._executor, TranscriptionHandler._executor)
+
+    def test_transcribe_submits_worker_to_pool(self):
+        """Test that transcribe_audio_data queues the worker instead of starting a thread."""
+        handler = _make_handler(self)
+        handler._executor = Mock()
+        samples = np.zeros(1600, dtype=np.int16)
+
+        handler.transcribe_audio_data(samples, prompt="prompt")
+
+        handler._executor.submit.assert_called_once_with(handler._transcribe_thread_worker, samples, "prompt")
+
+    def test_empty_audio_completes_without_submitting(self):
+        """Test that empty audio reports an empty result immediately."""
+        results = []
+        handler = _make_handler(self, on_transcription_complete_callback=lambda *result: results.append(result))
+        handler._executor = Mock()
+
+        handler.transcribe_audio_data(np.zeros(0, dtype=np.int16))
+
+        handler._executor.submit.assert_not_called()
+        self.assertEqual(results, [("", 0.0)])
+
+    def test_close_leaves_shared_executor_running(self):
+        """Test that close() stops the handler's cleanup pool but not the pool other handlers use."""
+        handler = _make_handler(self)
+
+        handler.close()
+
+        with self.assertRaises(RuntimeError):
+            handler._io_pool.submit(lambda: None)
+        self.assertEqual(TranscriptionHandler._executor.submit(lambda: 42).result(timeout=5), 42)
+
+
+@_requires_handler
+class TestLazyParakeetModel(unittest.TestCase):
+    """Test that the Parakeet model loads once, on first use, under its lock."""
+
+    def setUp(self):
+        self.handler = _make_handler(self)
+        self.handler.model_type = "parakeet"
+        self.handler._light_mode = False
+        self.parakeet_mlx = Mock()
+        self.parakeet_mlx.from_pretrained.side_effect = lambda repo: Mock(name=repo)
+        for name, value in (("PARAKEET_MLX_AVAILABLE", True), ("parakeet_mlx", self.parakeet_mlx)):
+            patcher = patch.object(transcription_handler, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_model_loads_on_first_access_only(self):
+        """Test that nothing loads until the property is read, and later reads reuse the model."""
+        self.parakeet_mlx.from_pretrained.assert_not_called()
+
+        model = self.handler.parakeet_model
+
+        self.assertIs(self.handler.parakeet_model, model)
+        self.parakeet_mlx.from_pretrained.assert_called_once_with(self.handler.selected_asr_model)
+
+    def test_concurrent_first_access_loads_once(self):
+        """Test that threads racing on the first access share a single load."""
+        barrier = threading.Barrier(8)
+        models = []
+
+        def read_model():
+            barrier.wait()
+            models.append(self.handler.parakeet_model)
+
+        threads = [threading.Thread(target=read_model) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.parakeet_mlx.from_pretrained.assert_called_once()
+        self.assertEqual(len(set(map(id, models))), 1)
+
+    def test_reset_reloads_on_next_access(self):
+        """Test that assigning None drops the model so the next read loads it again."""
+        first = self.handler.parakeet_model
+        self.handler.parakeet_model = None
+
+        self.assertIsNot(self.handler.parakeet_model, first)
+        self.assertEqual(self.parakeet_mlx.from_pretrained.call_count, 2)
+
+    def test_no_load_for_whisper_or_light_mode(self):
+        """Test that the property stays None when Parakeet is not the selected backend."""
+        for model_type, light_mode in (("whisper", False), ("parakeet", True)):
+            with self.subTest(model_type=model_type, light_mode=light_mode):
+                self.handler.model_type = model_type
+                self.handler._light_mode = light_mode
+                self.assertIsNone(self.handler.parakeet_model)
+        self.parakeet_mlx.from_pretrained.assert_not_called()
+
+    def test_preload_wraps_load_errors(self):
+        """Test that preload() reports a failed load as RuntimeError."""
+        self.parakeet_mlx.from_pretrained.side_effect = OSError("no weights")
+
+        with self.assertRaises(RuntimeError):
+            self.handler.preload()
+
+
+@_requires_handler
+class TestMlxWhisperPreload(unittest.TestCase):
+    """Test that MLX-Whisper weights are loaded into mlx_whisper's model cache up front."""
+
+    def setUp(self):
+        self.handler = _make_handler(self)
+        self.model_holder = Mock()
+        mlx_whisper = SimpleNamespace(transcribe=SimpleNamespace(ModelHolder=self.model_holder))
+        modules = patch.dict(sys.modules, {"mlx_whisper": mlx_whisper, "mlx_whisper.transcribe": mlx_whisper.transcribe})
+        modules.start()
+        self.addCleanup(modules.stop)
+        patches = {
+            "MLX_WHISPER_AVAILABLE": True,
+            "MLX_CORE_AVAILABLE": True,
+            "mx": SimpleNamespace(float16="float16", float32="float32"),
+        }
+        for name, value in patches.items():
+            patcher = patch.object(transcription_handler, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_preload_uses_transcribe_dtype(self):
+        """Test that the model is cached with the dtype transcribe() will ask for."""
+        for mlx_fp16, dtype in ((True, "float16"), (False, "float32")):
+            with self.subTest(mlx_fp16=mlx_fp16):
+                self.model_holder.reset_mock()
+                self.handler._mlx_fp16 = mlx_fp16
+                self.handler._preload_mlx_whisper("mlx-community/whisper-large-v3-turbo")
+                self.model_holder.get_model.assert_called_once_with("mlx-community/whisper-large-v3-turbo", dtype)
+
+    def test_preload_failure_is_not_fatal(self):
+        """Test that a failed preload is reported and left to the first transcription."""
+        statuses = []
+        self.handler.on_status_update = lambda message, color: statuses.append(color)
+        self.model_holder.get_model.side_effect = OSError("offline")
+
+        self.handler._preload_mlx_whisper("mlx-community/whisper-large-v3-turbo")
+
+        self.assertEqual(statuses, ["orange"])
+
+
+@_requires_handler
+class TestFloat32Conversion(unittest.TestCase):
+    """Test the int16 -> float32 scaling and its per-thread buffer."""
+
+    def test_scales_to_unit_range(self):
+        """Test that samples are scaled by 1/32768 into float32."""
+        out = _int16_to_float32(np.array([-32768, -16384, 0, 16384, 32767], dtype=np.int16))
+
+        self.assertEqual(out.dtype, np.float32)
+        np.testing.assert_array_equal(out, np.array([-1.0, -0.5, 0.0, 0.5, 32767 / 32768], dtype=np.float32))
+
+    def test_buffer_is_reused_per_thread(self):
+        """Test that a shorter clip reuses the thread's buffer and a longer one grows it."""
+        first = _int16_to_float32(np.ones(1000, dtype=np.int16))
+        second = _int16_to_float32(np.full(10, 16384, dtype=np.int16))
+        self.assertTrue(np.shares_memory(first, second))
+        np.testing.assert_array_equal(second, np.full(10, 0.5, dtype=np.float32))
+
+        third = _int16_to_float32(np.ones(100_000, dtype=np.int16))
+        self.assertEqual(third.shape, (100_000,))
+
+        other_thread = []
+        thread = threading.Thread(target=lambda: other_thread.append(_int16_to_float32(np.ones(10, dtype=np.int16))))
+        thread.start()
+        thread.join()
+        self.assertFalse(np.shares_memory(third, other_thread[0]))
+
+
+@_requires_handler
+class TestMlxInMemoryTranscription(unittest.TestCase):
+    """Test that MLX-Whisper gets the waveform in memory instead of a temp WAV."""
+
+    def setUp(self):
+        self.handler = _make_handler(self)
+        self.mlx_whisper = Mock()
+        self.mlx_whisper.transcribe.return_value = {"text": " hello world "}
+        patches = {
+            "MLX_WHISPER_AVAILABLE": True,
+            "MLX_CORE_AVAILABLE": False,
+            "mlx_whisper": self.mlx_whisper,
+            "log_text": Mock(),
+        }
+        for name, value in patches.items():
+            patcher = patch.object(transcription_handler, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_waveform_passed_without_temp_file(self):
+        """Test that the worker hands MLX a float32 array and never writes a WAV."""
+        results = []
+        self.handler.on_transcription_complete = lambda text, duration: results.append(text)
+        self.handler._save_temp_audio = Mock()
+        samples = np.full(1600, 16384, dtype=np.int16)
+
+        self.handler._transcribe_thread_worker(samples, "prompt")
+
+        self.handler._save_temp_audio.assert_not_called()
+        audio = self.mlx_whisper.transcribe.call_args.args[0]
+        self.assertIsInstance(audio, np.ndarray)
+        self.assertEqual(audio.dtype, np.float32)
+        np.testing.assert_array_equal(audio, np.full(1600, 0.5, dtype=np.float32))
+        self.assertEqual(self.mlx_whisper.transcribe.call_args.kwargs["prompt"], "prompt")
+        self.assertEqual(results, ["hello world"])
+
+
+if __name__ == '__main__':
+    unittest.main()
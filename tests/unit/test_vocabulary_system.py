@@ -12,6 +12,10 @@ import sys
 # Add src to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
 
+from unittest.mock import patch
+from types import SimpleNamespace
+
+import vocabulary.vocabulary_manager as vocabulary_manager_module
 from vocabulary.vocabulary_manager import VocabularyManager
 from vocabulary.vocabulary_api import VocabularyAPI, handle_vocabulary_command
 
@@ -65,6 +69,27 @@ class TestVocabularyManager(unittest.TestCase):
         self.assertEqual(corrections[0]['original'], "as throw my sin")
         self.assertEqual(corrections[0]['corrected'], "azithromycin")
     
+    def test_apply_corrections_respects_word_boundaries(self):
+        """Test that variations only match whole words."""
+        self.vocab_manager.add_custom_term("azithromycin", ["azith"], "medication")
+
+        corrected_text, corrections = self.vocab_manager.apply_corrections("azithro and azith_x")
+
+        self.assertEqual(corrected_text, "azithro and azith_x")
+        self.assertEqual(corrections, [])
+
+    def test_apply_corrections_prefers_longest_variation(self):
+        """Test that overlapping variations resolve to the longest match."""
+        self.vocab_manager.add_custom_term("metformin", ["met"], "medication")
+        self.vocab_manager.add_custom_term("metoprolol", ["met oh pro lol"], "medication")
+
+        corrected_text, corrections = self.vocab_manager.apply_corrections(
+            "Start met oh pro lol and met"
+        )
+
+        self.assertEqual(corrected_text, "Start metoprolol and metformin")
+        self.assertEqual([c['corrected'] for c in corrections], ["metoprolol", "metformin"])
+
     def test_learn_from_correction(self):
         """Test learning from user corrections."""
         # Learn a correction
@@ -126,7 +151,16 @@ class TestVocabularyManager(unittest.TestCase):
         self.assertEqual(stats['total_terms'], 2)
         self.assertEqual(stats['categories']['medication'], 1)
         self.assertEqual(stats['categories']['names'], 1)
-    
+
+        # Cached stats must reflect later changes
+        self.vocab_manager.learn_from_correction("new motor ax", "pneumothorax")
+        self.vocab_manager.apply_corrections("azithromycin")
+        stats = self.vocab_manager.get_vocabulary_stats()
+
+        self.assertEqual(stats['total_corrections'], 1)
+        self.assertEqual(stats['learning_patterns'], 1)
+        self.assertEqual(stats['total_usage'], 1)
+
     def test_suggestions(self):
         """Test correction suggestions."""
         # Add some terms
@@ -140,6 +174,87 @@ class TestVocabularyManager(unittest.TestCase):
         self.assertEqual(suggestions[0]['suggested'], "azithromycin")
 
 
+class _FakeSymSpell:
+    """Stand-in for symspellpy.SymSpell: returns dictionary terms sharing the query's first four letters."""
+
+    def __init__(self, max_dictionary_edit_distance, prefix_length):
+        self.terms = []
+
+    def create_dictionary_entry(self, term, count):
+        self.terms.append(term)
+
+    def lookup(self, phrase, verbosity, max_edit_distance):
+        return [SimpleNamespace(term=term) for term in self.terms if term[:4] == phrase[:4]]
+
+
+class TestMedicalLexicon(unittest.TestCase):
+    """Test the FDA Products.txt lexicon and its SymSpell/metaphone fuzzy matching."""
+
+    PRODUCTS = (
+        "ApplNo\tProductNo\tForm\tStrength\tReferenceDrug\tDrugName\tActiveIngredient\tReferenceStandard\n"
+        "1\t1\tCAPSULE\t250MG\t0\tAMOXIL\tAMOXICILLIN\t0\n"
+        "2\t1\tTABLET\t10MG\t0\tLipitor\tatorvastatin calcium; (as trihydrate)\t0\n"
+        "3\t1\tTABLET\t5MG\t0\tUNKNOWN\tlisinopril, hydrochlorothiazide\t0\n"
+    )
+
+    def setUp(self):
+        """Write a small Products.txt next to an empty vocabulary."""
+        self.test_dir = tempfile.mkdtemp()
+        self.products_path = os.path.join(self.test_dir, "Products.txt")
+        with open(self.products_path, 'w', encoding='utf-8') as f:
+            f.write(self.PRODUCTS)
+
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.test_dir)
+
+    def _load_lexicon(self):
+        vocab_manager = VocabularyManager(config_dir=self.test_dir)
+        vocab_manager._load_medical_lexicon_from_fda_products(self.products_path)
+        vocab_manager._build_medical_ngram_heads()
+        vocab_manager._build_medical_fuzzy_index()
+        return vocab_manager
+
+    @unittest.skipUnless(vocabulary_manager_module._get_polars() is not None, "polars not installed")
+    def test_polars_and_csv_parsers_agree(self):
+        """Test that the polars Products.txt parser yields the same lexicon as the csv.reader loop."""
+        with_polars = self._load_lexicon().medical_canonical_map
+        with patch.object(vocabulary_manager_module, '_get_polars', return_value=None):
+            with_csv = self._load_lexicon().medical_canonical_map
+
+        self.assertEqual(with_polars, with_csv)
+        self.assertEqual(list(with_csv), [
+            "amoxil", "amoxicillin", "lipitor", "atorvastatin calcium", "lisinopril", "hydrochlorothiazide",
+        ])
+
+    @unittest.skipUnless(vocabulary_manager_module._get_phonetics() is not None, "phonetics not installed")
+    def test_metaphone_fallback_without_symspell(self):
+        """Test that metaphone buckets are built and used only when symspellpy is missing."""
+        with patch.object(vocabulary_manager_module, 'SYMSPELL_AVAILABLE', False):
+            vocab_manager = self._load_lexicon()
+            corrected, corrections = vocab_manager.apply_medical_corrections("start amoxicilin today")
+
+        self.assertIsNone(vocab_manager._medical_symspell)
+        self.assertTrue(vocab_manager._medical_metaphone_buckets)
+        self.assertEqual(corrected, "start amoxicillin today")
+        self.assertEqual(corrections[0]['original'], "amoxicilin")
+
+    def test_symspell_lookup_skips_metaphone_index(self):
+        """Test that with symspellpy no metaphone codes or buckets are computed."""
+        with patch.object(vocabulary_manager_module, 'SYMSPELL_AVAILABLE', True), \
+                patch.object(vocabulary_manager_module, 'SymSpell', _FakeSymSpell, create=True), \
+                patch.object(vocabulary_manager_module, 'Verbosity', SimpleNamespace(CLOSEST=0), create=True), \
+                patch.object(vocabulary_manager_module, '_dmetaphone_codes') as dmetaphone_codes:
+            vocab_manager = self._load_lexicon()
+            corrected, _ = vocab_manager.apply_medical_corrections("start amoxicilin today")
+
+        dmetaphone_codes.assert_not_called()
+        self.assertEqual(vocab_manager.medical_metaphone_index, {})
+        self.assertEqual(vocab_manager._medical_metaphone_buckets, {})
+        self.assertIsInstance(vocab_manager._medical_symspell, _FakeSymSpell)
+        self.assertEqual(corrected, "start amoxicillin today")
+
+
 class TestVocabularyAPI(unittest.TestCase):
     """Test the vocabulary API interface."""
     
@@ -179,6 +294,37 @@ class TestVocabularyAPI(unittest.TestCase):
         self.assertEqual(len(result['terms']), 1)
         self.assertEqual(result['terms'][0]['correct'], "azithromycin")
     
+    def test_get_vocabulary_list_filters_and_ordering(self):
+        """Test category filtering and usage ordering of the vocabulary list."""
+        self.api.add_term("azithromycin", ["as throw my sin"], "medication")
+        self.api.add_term("acetaminophen", ["a seat a mino fen"], "medication")
+        self.api.add_term("Dr. Smith", [], "names")
+
+        result = self.api.get_vocabulary_list(category_filter="medication")
+        self.assertEqual([t['correct'] for t in result['terms']], ["acetaminophen", "azithromycin"])
+
+        # Usage changes the ordering, so a cached list must not be reused
+        self.vocab_manager.apply_corrections("give as throw my sin")
+        result = self.api.get_vocabulary_list(category_filter="medication")
+        self.assertEqual([t['correct'] for t in result['terms']], ["azithromycin", "acetaminophen"])
+
+        result = self.api.get_vocabulary_list(search_filter="SMITH")
+        self.assertEqual([t['key'] for t in result['terms']], ["names:dr. smith"])
+
+    def test_edit_term_removes_variations(self):
+        """Test removing variations via API."""
+        self.api.add_term("azithromycin", ["as throw my sin", "azith"], "medication")
+
+        result = self.api.edit_term("medication:azithromycin", remove_variations=["azith", "missing", "azith"])
+
+        self.assertTrue(result['success'])
+        self.assertIn("removed 1 variations: azith", result['message'])
+        self.assertEqual(
+            self.vocab_manager.custom_terms["medication:azithromycin"]['variations'],
+            ["azithromycin", "as throw my sin"]
+        )
+        self.assertEqual(self.vocab_manager.apply_corrections("azith")[0], "azith")
+
     def test_get_stats_api(self):
         """Test getting statistics via API."""
         # Add some terms
@@ -241,6 +387,163 @@ class TestVocabularyIntegration(unittest.TestCase):
         self.assertEqual(len(new_manager.custom_terms), 1)
         self.assertIn("general:azithromycin", new_manager.custom_terms)
     
+    def test_flush_persists_learned_corrections(self):
+        """Test that debounced changes are written by flush()."""
+        self.vocab_manager.learn_from_correction("new motor ax", "pneumothorax")
+        self.vocab_manager.flush()
+
+        new_manager = VocabularyManager(config_dir=self.test_dir)
+
+        self.assertEqual(len(new_manager.correction_history), 1)
+        self.assertIn("new motor ax -> pneumothorax", new_manager.learning_patterns)
+
+    def test_concurrent_saves_leave_valid_vocabulary_file(self):
+        """Test that synchronous saves and write-behind flushes never interleave or leave temp files."""
+        import json
+        import threading
+        self.vocab_manager.add_custom_term("azithromycin", ["as throw my sin"], "medication")
+
+        def save_repeatedly():
+            for _ in range(20):
+                self.vocab_manager._dirty_vocab = True
+                self.vocab_manager.flush()
+                self.vocab_manager.save_vocabulary()
+
+        threads = [threading.Thread(target=save_repeatedly) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        with open(os.path.join(self.test_dir, "user_vocabulary.json")) as f:
+            self.assertIn("medication:azithromycin", json.load(f)['terms'])
+        self.assertEqual([name for name in os.listdir(self.test_dir) if name.endswith(".tmp")], [])
+
+    def test_concurrent_corrections_keep_every_usage_count(self):
+        """Test that usage counts from concurrent corrections survive merges running alongside them."""
+        import threading
+        self.vocab_manager.add_custom_term("azithromycin", ["as throw my sin"], "medication")
+
+        def correct_repeatedly():
+            for _ in range(200):
+                self.vocab_manager.apply_corrections("start as throw my sin now")
+
+        def merge_repeatedly():
+            for _ in range(200):
+                self.vocab_manager._merge_usage_deltas()
+
+        threads = [threading.Thread(target=correct_repeatedly) for _ in range(4)]
+        threads.append(threading.Thread(target=merge_repeatedly))
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.vocab_manager._merge_usage_deltas()
+        self.assertEqual(self.vocab_manager.custom_terms["medication:azithromycin"]['usage_count'], 800)
+
+    @unittest.skipIf(os.name == 'nt', "POSIX permission bits")
+    def test_saves_keep_vocabulary_file_permissions(self):
+        """Test that atomic saves create files with the umask default and keep an existing file's mode."""
+        import stat
+        umask = os.umask(0)
+        os.umask(umask)
+        self.vocab_manager.add_custom_term("azithromycin", ["as throw my sin"], "medication")
+        vocabulary_file = os.path.join(self.test_dir, "user_vocabulary.json")
+        self.assertEqual(stat.S_IMODE(os.stat(vocabulary_file).st_mode), 0o666 & ~umask)
+
+        os.chmod(vocabulary_file, 0o640)
+        self.vocab_manager.save_vocabulary()
+        self.assertEqual(stat.S_IMODE(os.stat(vocabulary_file).st_mode), 0o640)
+
+    def test_failed_save_keeps_previous_vocabulary_file(self):
+        """Test that a save that fails mid-write leaves the last good file in place."""
+        self.vocab_manager.add_custom_term("azithromycin", ["as throw my sin"], "medication")
+        self.vocab_manager.custom_terms["general:broken"] = {'correct': object()}  # not JSON-serializable
+
+        self.vocab_manager.save_vocabulary()
+
+        del self.vocab_manager.custom_terms["general:broken"]
+        reloaded = VocabularyManager(config_dir=self.test_dir)
+        self.assertIn("medication:azithromycin", reloaded.custom_terms)
+        self.assertEqual([name for name in os.listdir(self.test_dir) if name.endswith(".tmp")], [])
+
+    def test_legacy_corrections_log_is_migrated(self):
+        """Test that a JSON list corrections log is converted to JSON Lines and appended to."""
+        import json
+        legacy_path = os.path.join(self.test_dir, "corrections_log.json")
+        with open(legacy_path, 'w') as f:
+            json.dump([{"original": "a fib", "corrected": "AFib"}], f)
+
+        manager = VocabularyManager(config_dir=self.test_dir)
+        manager.learn_from_correction("new motor ax", "pneumothorax")
+
+        self.assertFalse(os.path.exists(legacy_path))
+        with open(os.path.join(self.test_dir, "corrections_log.jsonl")) as f:
+            entries = [json.loads(line) for line in f]
+        self.assertEqual([e['corrected'] for e in entries], ["AFib", "pneumothorax"])
+        self.assertEqual(len(VocabularyManager(config_dir=self.test_dir).correction_history), 2)
+
+    def test_history_and_patterns_are_capped(self):
+        """Test that in-memory history and patterns stay bounded while totals stay exact."""
+        self.vocab_manager.CORRECTION_HISTORY_MAX = 2
+        self.vocab_manager.LEARNING_PATTERNS_MAX = 2
+        self.vocab_manager.correction_history = []
+        for word in ("alpha", "beta", "alpha", "gamma"):
+            self.vocab_manager.learn_from_correction(word, word.upper() + "X")
+
+        self.assertEqual([e['original'] for e in self.vocab_manager.correction_history], ["alpha", "gamma"])
+        # "alpha" was seen again after "beta", so "beta" is the one evicted
+        self.assertEqual(list(self.vocab_manager.learning_patterns), ["alpha -> alphax", "gamma -> gammax"])
+        self.assertEqual(self.vocab_manager.get_vocabulary_stats()['total_corrections'], 4)
+
+    def test_save_corrections_keeps_history_beyond_cap(self):
+        """Test that saving leaves older logged corrections on disk and only compaction drops them."""
+        self.vocab_manager.CORRECTION_HISTORY_MAX = 2
+        self.vocab_manager.correction_history = []
+        for word in ("alpha", "beta", "gamma"):
+            self.vocab_manager.learn_from_correction(word, word.upper() + "X")
+        log_path = os.path.join(self.test_dir, "corrections_log.jsonl")
+
+        self.vocab_manager.save_corrections()
+        with open(log_path) as f:
+            self.assertEqual(len(f.readlines()), 3)
+        self.assertEqual(self.vocab_manager.get_vocabulary_stats()['total_corrections'], 3)
+
+        self.vocab_manager.compact_corrections_log()
+        with open(log_path) as f:
+            self.assertEqual(len(f.readlines()), 2)
+        self.assertEqual(self.vocab_manager.get_vocabulary_stats()['total_corrections'], 2)
+
+    def test_lcs_fallback_matches_dynamic_programming(self):
+        """Test the bit-parallel LCS ratio (run uncompiled) and that it is only used without rapidfuzz."""
+        import difflib
+        import numpy as np
+
+        def lcs_ratio(a, b):
+            rows = [[0] * (len(b) + 1) for _ in range(len(a) + 1)]
+            for i, ca in enumerate(a):
+                for j, cb in enumerate(b):
+                    rows[i + 1][j + 1] = rows[i][j] + 1 if ca == cb else max(rows[i][j + 1], rows[i + 1][j])
+            return 2.0 * rows[-1][-1] / (len(a) + len(b))
+
+        with patch.object(vocabulary_manager_module, 'RAPIDFUZZ_AVAILABLE', False), \
+                patch.object(vocabulary_manager_module, '_get_lcs_ratio_kernel',
+                             return_value=vocabulary_manager_module._lcs_ratio), \
+                np.errstate(over='ignore'):
+            for a, b in [("azithromycin", "as throw my sin"), ("afib", "a fib"), ("x" * 64, "y" + "x" * 70)]:
+                self.assertAlmostEqual(vocabulary_manager_module._similarity_ratio(a, b), lcs_ratio(a, b))
+
+        with patch.object(vocabulary_manager_module, 'RAPIDFUZZ_AVAILABLE', False), \
+                patch.object(vocabulary_manager_module, '_get_lcs_ratio_kernel', return_value=None):
+            self.assertEqual(vocabulary_manager_module._similarity_ratio("afib", "a fib"),
+                             difflib.SequenceMatcher(None, "afib", "a fib").ratio())
+
+    def test_dissimilar_length_pair_scores_zero(self):
+        """Test that pairs too different in length to reach 0.3 get the 0.0 sentinel, not the bound."""
+        self.assertEqual(self.vocab_manager._calculate_confidence("ab", "abcdefghijklmnop"), 0.0)
+        self.assertEqual(self.vocab_manager._calculate_confidence("ab", "abc"), 0.8)
+
     def test_learning_workflow(self):
         """Test the complete learning workflow."""
         # Start with a transcription error
@@ -290,6 +593,11 @@ class TestVocabularyIntegration(unittest.TestCase):
             "azithromycin"
         )
 
+        # Legacy ISO dates are stored as Unix seconds and formatted again for display
+        self.assertNotIn("added_date", self.vocab_manager.custom_terms["medication:azithromycin"])
+        listed = self.vocab_manager.list_terms()
+        self.assertEqual(listed[0]['added_date'], "2025-01-07T00:00:00")
+
 
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file